@@ -15,9 +15,11 @@ This script gets called from a makefile, when any of the following need rebuildi
 * a ``*.IBS`` file
 * a ``*.TST`` file (a dummy place-holder indicating that the test run config. files have been made)
 
-All files will be rebuilt.
-(We rebuild all files, because it doesn't take very long, and we can
-insure consistency this way.)
+All files are considered for rebuilding, in order to insure consistency between them.
+However, any file whose inputs (i.e. - model configuration, EmPy template, and
+*PyIBIS-AMI* version) haven't changed since it was last built is skipped.
+(A SHA-256 digest of those inputs is kept alongside each output file, in ``<output file>.digest``.)
+Use the ``--force`` option to rebuild everything, regardless.
 
 This gets triggered by one of two things:
 
@@ -28,70 +30,131 @@ The idea here is that the ``*.IBS`` file, the ``*.AMI`` file, the C++ source fil
 and the test run configuration files should be configured from a common model
 configuration file, so as to ensure consistency between them all.
 """
+import importlib.machinery
 import importlib.util
+import io
+import os
+import sys
+from collections import namedtuple
 from datetime import date
+from functools import lru_cache
+from hashlib import sha256
 from pathlib import Path
+from types import MappingProxyType
 
 import click
-import em
-
-param_types = {
-    "INT": {"c_type": "int", "ami_type": "Integer", "getter": "get_param_int"},
-    "FLOAT": {"c_type": "double", "ami_type": "Float", "getter": "get_param_float"},
-    "TAP": {"c_type": "double", "ami_type": "Tap", "getter": "get_param_float"},
-    "BOOL": {"c_type": "bool", "ami_type": "Boolean", "getter": "get_param_bool"},
-    "STRING": {"c_type": "char *", "ami_type": "String", "getter": "get_param_str"},
+
+from pyibisami import __version__
+
+
+class ParamType(namedtuple("ParamType", "c_type ami_type getter")):
+    """C++ type, AMI type, and C++ parameter getter, for an AMI parameter type.
+
+    Notes:
+        1. Fields may also be looked up by name (i.e. - ``param_types["INT"]["c_type"]``),
+        as existing EmPy model templates do.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return super().__getitem__(key)
+
+
+param_types = MappingProxyType(
+    {
+        "INT": ParamType("int", "Integer", "get_param_int"),
+        "FLOAT": ParamType("double", "Float", "get_param_float"),
+        "TAP": ParamType("double", "Tap", "get_param_float"),
+        "BOOL": ParamType("bool", "Boolean", "get_param_bool"),
+        "STRING": ParamType("char *", "String", "get_param_str"),
+    }
+)
+
+
+def _emit_value(indent, param, out):
+    """Emit the AMI file text for a parameter with 'Value' format.
+
+    Args:
+        indent (str): String containing some number of spaces.
+        param (dict): Dictionary containing parameter definition fields.
+        out ([str]): List of text fragments to append to.
+    """
+    out.append(f"{indent}     (Value {param['default']} )\n")
+
+
+def _emit_list(indent, param, out):
+    """Emit the AMI file text for a parameter with 'List' format.
+
+    Args:
+        indent (str): String containing some number of spaces.
+        param (dict): Dictionary containing parameter definition fields.
+        out ([str]): List of text fragments to append to.
+    """
+    values = "".join(f"{item} " for item in param["values"])
+    labels = "".join(f"{item} " for item in param["labels"])
+    out.append(f"{indent}     (List {values})\n")
+    out.append(f"{indent}     (List_Tip {labels})\n")
+
+
+def _emit_range(indent, param, out):
+    """Emit the AMI file text for a parameter with 'Range' (or any other
+    unlisted) format.
+
+    Args:
+        indent (str): String containing some number of spaces.
+        param (dict): Dictionary containing parameter definition fields.
+        out ([str]): List of text fragments to append to.
+    """
+    out.append(f"{indent}     ({param['format']} {param['default']} {param['min']} {param['max']} )\n")
+
+
+# Emitters of the format specific portion of a parameter definition, keyed by format.
+format_emitters = {
+    "Value": _emit_value,
+    "List": _emit_list,
+    "Range": _emit_range,
 }
 
 
-def print_param(indent, name, param):  # pylint: disable=too-many-branches
+def print_param(indent, name, param):
     """Print AMI parameter specification. Handle nested parameters, via
-    recursion.
+    an explicit stack.
 
     Args:
         indent (str): String containing some number of spaces.
         name (str): Parameter name.
         param (dict): Dictionary containing parameter definition fields.
+
+    Notes:
+        1. The entire specification is written to ``sys.stdout`` at once.
     """
 
-    print(indent, f"({name}")
-    if "subs" in param:
-        for key in param["subs"]:
-            print_param(indent + "    ", key, param["subs"][key])
-        if "description" in param:
-            print(indent + "    ", f"(Description {param['description']})")
-    else:
-        for fld_name, fld_key in [
-            ("Usage", "usage"),
-            ("Type", "type"),
-            ("Format", "format"),
-            ("Default", "default"),
-            ("Description", "description"),
-        ]:
-            # Trap the special cases.
-            if fld_name == "Type":
-                print(indent, "    (Type", param_types[param["type"]]["ami_type"], ")")
-            elif fld_name == "Default":
-                if param["format"] == "Value":
-                    pass
-            elif fld_name == "Format":
-                if param["format"] == "Value":
-                    print(indent, "    (Value", param["default"], ")")
-                elif param["format"] == "List":
-                    print(indent, "    (List", end=" ")
-                    for item in param["values"]:
-                        print(item, end=" ")
-                    print(")")
-                    print(indent, "    (List_Tip", end=" ")
-                    for item in param["labels"]:
-                        print(item, end=" ")
-                    print(")")
-                else:
-                    print(indent, f"    ({param['format']}", param["default"], param["min"], param["max"], ")")
-            # Execute the default action.
-            else:
-                print(indent, f"    ({fld_name}", param[fld_key], ")")
-    print(indent, ")")
+    out = []
+    # Holds either parameters still to be visited, or text to be emitted after their sub-parameters.
+    stack = [(indent, name, param)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+        indent, name, param = item
+        out.append(f"{indent} ({name}\n")
+        if "subs" in param:
+            closing = f"{indent} )\n"
+            if "description" in param:
+                closing = f"{indent}     (Description {param['description']})\n" + closing
+            stack.append(closing)
+            stack.extend(reversed([(indent + "    ", key, sub) for key, sub in param["subs"].items()]))
+            continue
+        out.append(f"{indent}     (Usage {param['usage']} )\n")
+        out.append(f"{indent}     (Type {param_types[param['type']].ami_type} )\n")
+        format_emitters.get(param["format"], _emit_range)(indent, param, out)
+        out.append(f"{indent}     (Description {param['description']} )\n")
+        out.append(f"{indent} )\n")
+    sys.stdout.write("".join(out))
 
 
 def print_code(pname, param):
@@ -100,75 +163,224 @@ def print_code(pname, param):
     Args:
         pname (str): Parameter name.
         param (dict): Dictionary containing parameter definition fields.
+
+    Notes:
+        1. The entire code block is written to ``sys.stdout`` at once.
     """
 
-    print("       ", f'node_names.push_back("{pname}");')
-    if "subs" in param:
-        for key in param["subs"]:
-            print_code(key, param["subs"][key])
-    else:
-        if param["usage"] == "In" or param["usage"] == "InOut":
+    out = []
+    # Holds either parameters still to be visited, or text to be emitted after their sub-parameters.
+    stack = [(pname, param)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+        pname, param = item
+        out.append(f'        node_names.push_back("{pname}");\n')
+        stack.append("        node_names.pop_back();\n")
+        if "subs" in param:
+            stack.extend(reversed(list(param["subs"].items())))
+        elif param["usage"] == "In" or param["usage"] == "InOut":
             ptype = param["type"]
-            print(f"        {param_types[ptype]['c_type']} {pname};")
-            if ptype == "BOOL":
-                print(f"        {pname} = {param_types[ptype]['getter']}(node_names, {param['default'].lower()});")
-            else:
-                print(f"        {pname} = {param_types[ptype]['getter']}(node_names, {param['default']});")
-    print("       ", "node_names.pop_back();")
+            ptype_info = param_types[ptype]
+            default = param["default"].lower() if ptype == "BOOL" else param["default"]
+            out.append(
+                f"        {ptype_info.c_type} {pname};\n"
+                f"        {pname} = {ptype_info.getter}(node_names, {default});\n"
+            )
+    sys.stdout.write("".join(out))
 
 
-def mk_model(ibis_params, ami_params, model_name, description, out_dir="."):
+@lru_cache(maxsize=None)
+def _read_template(em_file, mtime_ns):
+    """Read the contents of an EmPy template file.
+
+    Args:
+        em_file (Path): Template file name.
+        mtime_ns (int): Template file modification time (ns).
+            Only used as part of the cache key, so that an edited template gets re-read.
+
+    Returns:
+        str: The template contents.
+    """
+    del mtime_ns
+    with open(em_file, "rt", encoding="utf-8") as in_file:
+        return in_file.read()
+
+
+def _load_template(em_file):
+    """Fetch the contents of an EmPy template file, reading it only once per
+    process, unless it changes.
+
+    Args:
+        em_file (str or Path): Template file name.
+
+    Returns:
+        str: The template contents.
+    """
+    em_file = Path(em_file).resolve()
+    return _read_template(em_file, em_file.stat().st_mtime_ns)
+
+
+# Generated files are written sequentially, in one go, through a buffer large enough to hold any of them.
+# (``O_BINARY`` keeps the Windows C runtime from translating line endings a second time,
+# on top of the translation done by the text mode wrapper.)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_SEQUENTIAL", 0)
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _write_atomically(file_name, text):
+    """Write some text to a file, in a single system call where possible, via
+    a temporary file, so that an interrupted write never leaves a partial file behind.
+
+    Args:
+        file_name (Path): Name of file to write.
+        text (str): The complete file contents.
+    """
+    tmp_file = file_name.with_name(file_name.name + ".tmp")
+    fd = os.open(tmp_file, _WRITE_FLAGS, 0o666)  # Subject to the umask, as with ``open()``.
+    with os.fdopen(fd, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as out_file:
+        out_file.write(text)
+    os.replace(tmp_file, file_name)
+
+
+def _canonical(obj):
+    """Convert a model configuration value into a form whose ``repr()`` captures it in full.
+
+    Args:
+        obj (Any): The value to convert.
+
+    Returns:
+        Any: An equivalent structure of tuples, lists, and primitive values,
+        tagged with the original container types.
+
+    Notes:
+        1. Needed, because ``repr()`` abbreviates long *NumPy* arrays,
+            which would hide changes to their contents from the input digest.
+    """
+    if isinstance(obj, dict):
+        return (type(obj).__name__, [(_canonical(key), _canonical(val)) for key, val in obj.items()])
+    if isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, [_canonical(val) for val in obj])
+    if hasattr(obj, "tolist"):  # *NumPy* arrays and scalars
+        return (type(obj).__name__, str(getattr(obj, "dtype", "")), obj.tolist())
+    return obj
+
+
+def mk_model(  # pylint: disable=too-many-arguments
+    ibis_params, ami_params, model_name, description, out_dir=".", force=False
+):
     """
     Generate ibis, ami, and cpp files, by merging the
     device specific parameterization with the templates.
+
+    Any file whose inputs haven't changed since it was last generated is skipped,
+    unless ``force`` is True.
     """
 
     py_file = (Path(out_dir).resolve() / model_name).with_suffix(".py")
-    # Configure the model files.
-    for ext in ["cpp", "ami", "ibs"]:
+    params_repr = repr(_canonical((ibis_params, ami_params, dict(param_types), model_name, description, __version__)))
+    pkg_dir = Path(__file__).parent
+    em_files = {
+        "cpp": py_file.with_suffix(".cpp.em"),
+        "ami": pkg_dir / "generic.ami.em",
+        "ibs": pkg_dir / "generic.ibs.em",
+    }
+    # Built once, and copied for each template; see below.
+    em_globals = {
+        "ami_params": ami_params,
+        "ibis_params": ibis_params,
+        "param_types": param_types,
+        "model_name": model_name,
+        "description": description,
+        "date": str(date.today()),
+    }
+
+    # Decide which model files need building.
+    # (This must be done before creating the interpreter below, since EmPy captures ``sys.stdout``.)
+    builds = []
+    for ext, em_file in em_files.items():
         out_file = py_file.with_suffix(f".{ext}")
-        if ext == "ami":
-            em_file = Path(__file__).parent.joinpath("generic.ami.em")
-        elif ext == "ibs":
-            em_file = Path(__file__).parent.joinpath("generic.ibs.em")
-        else:
-            em_file = out_file.with_suffix(".cpp.em")
-
+        template = _load_template(em_file)
+        digest = sha256((params_repr + template).encode("utf-8")).hexdigest()
+        digest_file = out_file.with_suffix(f".{ext}.digest")
+        if (
+            not force
+            and out_file.exists()  # noqa: W503
+            and digest_file.exists()  # noqa: W503
+            and digest_file.read_text(encoding="utf-8") == digest  # noqa: W503
+        ):
+            print(f"'{out_file}' is up to date.")
+            continue
         print(f"Building '{out_file}' from '{em_file}'...")
-        with open(out_file, "w", encoding="utf-8") as out_file:
-            interpreter = em.Interpreter(
-                output=out_file,
-                globals={
-                    "ami_params": ami_params,
-                    "ibis_params": ibis_params,
-                    "param_types": param_types,
-                    "model_name": model_name,
-                    "description": description,
-                    "date": str(date.today()),
-                },
-            )
-            try:
-                with open(em_file, "rt", encoding="utf-8") as in_file:
-                    interpreter.file(in_file)
-            finally:
-                interpreter.shutdown()
+        builds.append((out_file, template, digest_file, digest))
+    if not builds:
+        return
+
+    # Configure the model files, using a single interpreter.
+    import em  # pylint: disable=import-outside-toplevel  # Only needed when actually building something.
+
+    out_buf = io.StringIO()
+    interpreter = em.Interpreter(output=out_buf)
+    try:
+        for out_file, template, digest_file, digest in builds:
+            # Give each template a fresh namespace, so that nothing defined by one leaks into the next.
+            # (EmPy writes into its globals, so ``em_globals`` itself is never handed over.)
+            interpreter.setGlobals(dict(em_globals))
+            interpreter.string(template)
+            interpreter.flush()
+            _write_atomically(out_file, out_buf.getvalue())
+            out_buf.seek(0)
+            out_buf.truncate()
+            _write_atomically(digest_file, digest)
+    finally:
+        interpreter.shutdown()
+
+
+@lru_cache(maxsize=256)
+def _load_config(py_file, mtime_ns, size):
+    """Load a model configuration file, executing it only once per process,
+    unless it changes.
+
+    Args:
+        py_file (Path): Model configuration file name.
+        mtime_ns (int): Configuration file modification time (ns).
+        size (int): Configuration file size (bytes).
+            Both only used as part of the cache key, so that an edited configuration gets reloaded.
+
+    Returns:
+        module: The executed model configuration.
+    """
+    del mtime_ns, size
+    file_base_name = py_file.stem
+    # Use an explicit source loader, so that the byte-compiled configuration
+    # gets cached in, and reused from, ``__pycache__``, like any other module.
+    loader = importlib.machinery.SourceFileLoader(file_base_name, str(py_file))
+    spec = importlib.util.spec_from_loader(file_base_name, loader)
+    cfg = importlib.util.module_from_spec(spec)
+    loader.exec_module(cfg)
+    return cfg
 
 
-def ami_config(py_file):
+def ami_config(py_file, force=False):
     """
     Read in the ``py_file`` and cpp.em files,
     then generate: ibis, ami, and cpp files.
+
+    Files whose inputs haven't changed are not regenerated, unless ``force`` is True.
     """
 
-    file_base_name = Path(py_file).stem
+    py_path = Path(py_file).resolve()
+    py_stat = py_path.stat()
 
     # Read model configuration information.
     print(f"Reading model configuration information from file: {py_file}.")
-    spec = importlib.util.spec_from_file_location(file_base_name, py_file)
-    cfg = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(cfg)
+    cfg = _load_config(py_path, py_stat.st_mtime_ns, py_stat.st_size)
 
-    mk_model(cfg.ibis_params, cfg.ami_params, cfg.kFileBaseName, cfg.kDescription, out_dir=Path(py_file).parent)
+    mk_model(
+        cfg.ibis_params, cfg.ami_params, cfg.kFileBaseName, cfg.kDescription, out_dir=py_path.parent, force=force
+    )
 
 
 def mk_combs(dict_items):
@@ -240,8 +452,9 @@ def mk_tests(test_defs, file_base_name, test_dir="test_runs"):  # pylint: disabl
 # @click.option(
 #     "-d", "--test_dir", show_default=True, default="test_runs", help="Output directory for test run generation."
 # )
+@click.option("--force", "-f", is_flag=True, help="Rebuild all files, even if their inputs haven't changed.")
 @click.version_option()
-def main(py_file):
+def main(py_file, force):
     """Configure IBIS-AMI model C++ source code, IBIS model, and AMI file.
 
     This command generates three files based off the input config file.
@@ -250,7 +463,7 @@ def main(py_file):
 
        py_file: name of model configuration file (*.py)
     """
-    ami_config(py_file)
+    ami_config(py_file, force=force)
 
 
 if __name__ == "__main__":
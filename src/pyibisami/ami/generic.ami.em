@@ -7,7 +7,7 @@ import sys
 from pyibisami.ami import config as ac
 
 for (sec_name, sec_key) in [('Reserved_Parameters', 'reserved'), ('Model_Specific', 'model')]:
-    print("    (%s" % sec_name)
+    print(f"    ({sec_name}")
     for param_name in ami_params[sec_key]:
         param = ami_params[sec_key][param_name]
         try:
@@ -54,9 +54,9 @@ This IBIS file was generated using the template file: "generic.ibs.em".
 [Package]
 
 @{
-print("R_pkg    %5.2f    %5.2f    %5.2f"  % (r_pkg[0],         r_pkg[1],         r_pkg[2]))
-print("L_pkg    %5.2fn   %5.2fn   %5.2fn" % (l_pkg[0] * 1.e9,  l_pkg[1] * 1.e9,  l_pkg[2] * 1.e9))
-print("C_pkg    %5.2fp   %5.2fp   %5.2fp" % (c_pkg[0] * 1.e12, c_pkg[1] * 1.e12, c_pkg[2] * 1.e12))
+print(f"R_pkg    {r_pkg[0]:5.2f}    {r_pkg[1]:5.2f}    {r_pkg[2]:5.2f}")
+print(f"L_pkg    {l_pkg[0] * 1.e9:5.2f}n   {l_pkg[1] * 1.e9:5.2f}n   {l_pkg[2] * 1.e9:5.2f}n")
+print(f"C_pkg    {c_pkg[0] * 1.e12:5.2f}p   {c_pkg[1] * 1.e12:5.2f}p   {c_pkg[2] * 1.e12:5.2f}p")
 }
 
 [Pin]  signal_name        model_name            R_pin  L_pin  C_pin
@@ -76,15 +76,15 @@ print("C_pkg    %5.2fp   %5.2fp   %5.2fp" % (c_pkg[0] * 1.e12, c_pkg[1] * 1.e12,
 Model_type   @(model_type)
 
 @{
-print("C_comp    %5.2fp   %5.2fp   %5.2fp" % (c_comp[0] * 1.e12, c_comp[1] * 1.e12, c_comp[2] * 1.e12))
+print(f"C_comp    {c_comp[0] * 1.e12:5.2f}p   {c_comp[1] * 1.e12:5.2f}p   {c_comp[2] * 1.e12:5.2f}p")
 if(model_type == 'Output'):
-    print("Cref  = {}".format(c_ref))
-    print("Vref  = {}".format(v_ref))
-    print("Vmeas = {}".format(v_meas))
-    print("Rref  = {}".format(r_ref))
+    print(f"Cref  = {c_ref}")
+    print(f"Vref  = {v_ref}")
+    print(f"Vmeas = {v_meas}")
+    print(f"Rref  = {r_ref}")
 else:
-    print("Vinl = {}".format(voltage_range[0] / 2. - 0.025))
-    print("Vinh = {}".format(voltage_range[0] / 2. + 0.025))
+    print(f"Vinl = {voltage_range[0] / 2. - 0.025}")
+    print(f"Vinh = {voltage_range[0] / 2. + 0.025}")
 }
 
 [Algorithmic Model]
@@ -95,44 +95,44 @@ Executable Windows_VisualStudio_64    @(model_name)_x86_amd64.dll  @(model_name)
 [End Algorithmic Model]
 
 @{
-print("[Temperature_Range]    %5.1f    %5.1f    %5.1f" % (temperature_range[0], temperature_range[1], temperature_range[2]))
-print("[Voltage_Range]        %5.2f    %5.2f    %5.2f" % (voltage_range[0],     voltage_range[1],     voltage_range[2]))
+print(f"[Temperature_Range]    {temperature_range[0]:5.1f}    {temperature_range[1]:5.1f}    {temperature_range[2]:5.1f}")
+print(f"[Voltage_Range]        {voltage_range[0]:5.2f}    {voltage_range[1]:5.2f}    {voltage_range[2]:5.2f}")
 }
 
 @{
 if(model_type == 'Output'):
     print("[Pulldown]")
-    print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (-1. * voltage_range[0], -10., -10., -10.))
+    print(f"{-1. * voltage_range[0]:<5.2f}    {-10.:<10.3e}    {-10.:<10.3e}    {-10.:<10.3e}")
     for v in [k * voltage_range[0] for k in range(2)]:
         i = v / array(impedance)
-        print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (v, i[0], i[1], i[2]))
-    print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (2. * voltage_range[0], 10., 10., 10.))
+        print(f"{v:<5.2f}    {i[0]:<10.3e}    {i[1]:<10.3e}    {i[2]:<10.3e}")
+    print(f"{2. * voltage_range[0]:<5.2f}    {10.:<10.3e}    {10.:<10.3e}    {10.:<10.3e}")
 
     print("[Pullup]")
-    print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (-1. * voltage_range[0], 10., 10., 10.))
+    print(f"{-1. * voltage_range[0]:<5.2f}    {10.:<10.3e}    {10.:<10.3e}    {10.:<10.3e}")
     for v in [k * voltage_range[0] for k in range(2)]:
         i = -1. * v / array(impedance)
-        print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (v, i[0], i[1], i[2]))
-    print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (2. * voltage_range[0], -10., -10., -10.))
+        print(f"{v:<5.2f}    {i[0]:<10.3e}    {i[1]:<10.3e}    {i[2]:<10.3e}")
+    print(f"{2. * voltage_range[0]:<5.2f}    {-10.:<10.3e}    {-10.:<10.3e}    {-10.:<10.3e}")
 
     print("[Ramp]")
     dv = 0.6 * array([v * 50. / (50. + z) for (v, z) in zip(voltage_range, impedance)])
     dt = 1.e12 * dv / array(slew_rate)
-    print("dV/dt_r    %5.3f/%5.2fp    %5.3f/%5.2fp    %5.3f/%5.2fp" % (dv[0], dt[0], dv[1], dt[1], dv[2], dt[2]))
-    print("dV/dt_f    %5.3f/%5.2fp    %5.3f/%5.2fp    %5.3f/%5.2fp" % (dv[0], dt[0], dv[1], dt[1], dv[2], dt[2]))
+    print(f"dV/dt_r    {dv[0]:5.3f}/{dt[0]:5.2f}p    {dv[1]:5.3f}/{dt[1]:5.2f}p    {dv[2]:5.3f}/{dt[2]:5.2f}p")
+    print(f"dV/dt_f    {dv[0]:5.3f}/{dt[0]:5.2f}p    {dv[1]:5.3f}/{dt[1]:5.2f}p    {dv[2]:5.3f}/{dt[2]:5.2f}p")
     print("")
 else:
     print("[GND Clamp]")
-    print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (-1. * voltage_range[0], -10., -10., -10.))
+    print(f"{-1. * voltage_range[0]:<5.2f}    {-10.:<10.3e}    {-10.:<10.3e}    {-10.:<10.3e}")
     for v in [k * voltage_range[0] for k in range(3)]:
         i = v / array(impedance) / 2
-        print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (v, i[0], i[1], i[2]))
+        print(f"{v:<5.2f}    {i[0]:<10.3e}    {i[1]:<10.3e}    {i[2]:<10.3e}")
     print("")
     print("[Power Clamp]")
-    print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (-1. * voltage_range[0], 10., 10., 10.))
+    print(f"{-1. * voltage_range[0]:<5.2f}    {10.:<10.3e}    {10.:<10.3e}    {10.:<10.3e}")
     for v in [k * voltage_range[0] for k in range(3)]:
         i = v / array(impedance) / 2
-        print("%-5.2f    %-10.3e    %-10.3e    %-10.3e" % (v, -i[0], -i[1], -i[2]))
+        print(f"{v:<5.2f}    {-i[0]:<10.3e}    {-i[1]:<10.3e}    {-i[2]:<10.3e}")
     print("")
 }
 
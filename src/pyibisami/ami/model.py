@@ -7,8 +7,19 @@ Original Date:   July 3, 2012
 Copyright (c) 2019 David Banas; All rights reserved World wide.
 """
 
-import copy as cp
-from ctypes import CDLL, byref, c_char_p, c_double  # pylint: disable=no-name-in-module
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import (  # pylint: disable=no-name-in-module
+    CDLL,
+    POINTER,
+    byref,
+    c_char_p,
+    c_double,
+    c_long,
+    c_void_p,
+    cast,
+    create_string_buffer,
+)
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -20,6 +31,41 @@ from pyibisami.common import *  # pylint: disable=wildcard-import,unused-wildcar
 
 
 
+@lru_cache(maxsize=16)
+def _read_wave(filename, mtime_ns):
+    """Read a waveform file.
+
+    Args:
+        filename (Path): Name of waveform file to read in.
+        mtime_ns (int): Waveform file modification time (ns).
+            Only used as part of the cache key, so that an edited file gets re-read.
+
+    Returns:
+        (Rvec, Rvec): A pair of read-only *NumPy* arrays containing the time
+            and voltage values, respectively.
+    """
+    del mtime_ns
+    time, voltage = np.loadtxt(filename, skiprows=1, usecols=(0, 1), ndmin=2, unpack=True, encoding="utf-8")
+    time.flags.writeable = False  # Shared by all callers, via the cache.
+    voltage.flags.writeable = False
+    return (time, voltage)
+
+
+def _load_wave(filename):
+    """Fetch the contents of a waveform file, reading it only once per
+    process, unless it changes.
+
+    Args:
+        filename (str or Path): Name of waveform file to read in.
+
+    Returns:
+        (Rvec, Rvec): A pair of read-only *NumPy* arrays containing the time
+            and voltage values, respectively.
+    """
+    filename = Path(filename).resolve()
+    return _read_wave(filename, filename.stat().st_mtime_ns)
+
+
 def loadWave(filename):
     """Load a waveform file.
 
@@ -31,22 +77,19 @@ def loadWave(filename):
     saved from *CosmosScope*.
 
     Args:
-        filename (str): Name of waveform file to read in.
+        filename (str or Path): Name of waveform file to read in.
 
     Returns:
-        ([float], [float]): A pair of *NumPy* arrays containing the time
+        (Rvec, Rvec): A pair of *NumPy* arrays containing the time
             and voltage values, respectively.
+
+    Notes:
+        1. The file is parsed by ``np.loadtxt()``, only once per process unless it changes;
+            each call returns fresh, writable copies of the cached arrays.
     """
 
-    with open(filename, "r", encoding="utf-8") as theFile:
-        theFile.readline()  # Consume the header line.
-        time = []
-        voltage = []
-        for line in theFile:
-            tmp = list(map(float, line.split()))
-            time.append(tmp[0])
-            voltage.append(tmp[1])
-        return (np.array(time), np.array(voltage))
+    time, voltage = _load_wave(filename)
+    return (time.copy(), voltage.copy())
 
 
 def interpFile(filename, sample_per):
@@ -58,24 +101,82 @@ def interpFile(filename, sample_per):
         sample_per (float): New sample interval, in seconds.
 
     Returns:
-        [float]: A *NumPy* array containing the resampled waveform.
+        Rvec: A *NumPy* array containing the resampled waveform.
+
+    Notes:
+        1. The resampling is done in a single vectorized pass;
+            there is no per-sample Python loop.
+        2. The result is cached, so that resampling the same (unchanged) file,
+            at the same rate, again (e.g. - during a parameter sweep) costs only a copy.
     """
 
-    impulse = loadWave(filename)
-    ts = impulse[0]
+    filename = Path(filename).resolve()
+    return _resample_wave(filename, filename.stat().st_mtime_ns, float(sample_per)).copy()
+
+
+@lru_cache(maxsize=16)
+def _resample_wave(filename, mtime_ns, sample_per):
+    """Resample a waveform file.
+
+    Args:
+        filename (Path): Name of waveform file to read in.
+        mtime_ns (int): Waveform file modification time (ns).
+        sample_per (float): New sample interval, in seconds.
+
+    Returns:
+        Rvec: A read-only *NumPy* array containing the resampled waveform.
+    """
+    ts, vs = _read_wave(filename, mtime_ns)
     ts = ts - ts[0]
-    vs = impulse[1]
     tmax = ts[-1]
+    t_new = np.arange(0.0, tmax, sample_per)
+    # Skip the interpolation, when the file is already uniformly sampled at the new sampling period.
+    dts = np.diff(ts)
+    if dts.size and np.allclose(dts, sample_per, rtol=1e-9, atol=0.0):
+        res = vs[: len(t_new)]
     # Build new impulse response, at new sampling period, using linear interpolation.
-    res = []
-    t = 0.0
-    i = 0
-    while t < tmax:
-        while ts[i] <= t:
-            i = i + 1
-        res.append(vs[i - 1] + (vs[i] - vs[i - 1]) * (t - ts[i - 1]) / (ts[i] - ts[i - 1]))
-        t = t + sample_per
-    return np.array(res)
+    elif not (dts > 0).all():  # ``np.interp()`` requires strictly increasing time values.
+        res = _interp_unordered(t_new, ts, vs)
+    else:
+        res = np.interp(t_new, ts, vs)
+    res.flags.writeable = False  # Shared by all callers, via the cache.
+    return res
+
+
+def _interp_unordered(t_new, ts, vs):
+    """Linearly interpolate a waveform whose time values aren't strictly increasing.
+
+    Each new sample is interpolated between the first point later than it and the point preceding that one,
+    which keeps ``interpFile()`` tolerant of glitches (e.g. - repeated or out of order time values) in its input.
+
+    Args:
+        t_new (Rvec): New sample times, in increasing order, starting no earlier than ``ts[0]``
+            and ending before ``max(ts)``.
+        ts (Rvec): Original sample times.
+        vs (Rvec): Original sample values.
+
+    Returns:
+        Rvec: The interpolated values at ``t_new``.
+    """
+    # The first point later than ``t`` is also the first point at which the running maximum of ``ts`` exceeds ``t``.
+    ix = np.searchsorted(np.maximum.accumulate(ts), t_new, side="right")
+    t0 = ts[ix - 1]
+    v0 = vs[ix - 1]
+    return v0 + (vs[ix] - v0) * (t_new - t0) / (ts[ix] - t0)
+
+
+def _read_only_view(arr):
+    """Wrap an array in a read-only view, without copying its data.
+
+    Args:
+        arr (Rvec): The array to wrap.
+
+    Returns:
+        Rvec: A view of ``arr``, through which it can't be modified.
+    """
+    view = arr.view()
+    view.flags.writeable = False
+    return view
 
 
 class AMIModelInitializer:
@@ -97,7 +198,7 @@ class AMIModelInitializer:
     ami_params = {"root_name": ""}
 
     _init_data = {
-        "channel_response": (c_double * 128)(0.0, 1.0, 0.0),
+        "channel_response": np.pad([0.0, 1.0], (0, 126)),
         "row_size": 128,
         "num_aggressors": 0,
         "sample_interval": c_double(25.0e-12),
@@ -114,10 +215,16 @@ class AMIModelInitializer:
         Valid names of optional initialization data overrides:
 
         - channel_response
-            a matrix of ``c_double's`` where the first row represents the
+            a matrix of doubles (anything convertible to a C-contiguous
+            *NumPy* array) where the first row represents the
             impulse response of the analog channel, and the rest represent
             the impulse responses of several aggressor-to-victim far end
             crosstalk (FEXT) channels.
+            May also be the name of a waveform file, which gets resampled
+            at ``sample_interval``.
+
+            A flat vector holds ``num_aggressors + 1`` rows, back to back,
+            and sets ``row_size`` accordingly.
 
             Default) a single 128 element vector containing an ideal impulse
 
@@ -133,13 +240,13 @@ class AMIModelInitializer:
             Default) 0
 
         - sample_interval
-            c_double giving the time interval, in seconds, between
+            float (or c_double) giving the time interval, in seconds, between
             successive elements in any row of ``channel_response``.
 
             Default) 25e-12 (40 GHz sampling rate)
 
         - bit_time
-            c_double giving the bit period (i.e. - unit interval) of the
+            float (or c_double) giving the bit period (i.e. - unit interval) of the
             link, in seconds.
 
             Default) 100e-12 (10 Gbits/s)
@@ -148,26 +255,31 @@ class AMIModelInitializer:
         self.ami_params = {"root_name": ""}
         self.ami_params.update(ami_params)
         self.info_params = info_params
+        # Each instance gets its own copy of the defaults, so that overrides don't leak into other instances.
+        # (The default channel response is shared, but never modified in place.)
+        self._init_data = dict(AMIModelInitializer._init_data)
 
-        # Need to reverse sort, in order to catch ``sample_interval`` and ``row_size``,
-        # before ``channel_response``, since ``channel_response`` depends upon ``sample_interval``,
-        # when ``h`` is a file name, and overwrites ``row_size``, in any case.
-        keys = list(optional_args.keys())
-        keys.sort(reverse=True)
-        if keys:
-            for key in keys:
-                if key in self._init_data:
-                    self._init_data[key] = optional_args[key]
+        # Apply the overrides via their properties, taking ``channel_response`` last,
+        # since it depends upon ``sample_interval``, when ``h`` is a file name,
+        # and overwrites ``row_size`` and ``num_aggressors``, in any case.
+        for key in ("sample_interval", "bit_time", "row_size", "num_aggressors", "channel_response"):
+            if key in optional_args:
+                setattr(self, key, optional_args[key])
 
     def _getChannelResponse(self):
-        return list(map(float, self._init_data["channel_response"]))
+        return np.array(self._init_data["channel_response"], dtype=np.float64)
 
     def _setChannelResponse(self, h):
         if isinstance(h, str) and Path(h).is_file():
-            h = interpFile(h, self.sample_interval)
-        Vector = c_double * len(h)
-        self._init_data["channel_response"] = Vector(*h)
-        self.row_size = len(h)
+            h = interpFile(h, self.sample_interval)  # Already a fresh, C-contiguous, float64 array.
+        else:
+            h = np.array(h, dtype=np.float64)  # Always a C-contiguous copy, with one row per channel.
+        self._init_data["channel_response"] = h
+        if h.ndim == 2:
+            self.row_size = h.shape[-1]
+            self.num_aggressors = h.shape[0] - 1
+        else:  # A flat vector holds the victim row followed by any aggressor rows.
+            self.row_size = len(h) // (self.num_aggressors + 1)
 
     channel_response = property(
         _getChannelResponse,
@@ -197,7 +309,7 @@ class AMIModelInitializer:
         return float(self._init_data["sample_interval"].value)
 
     def _setSampleInterval(self, T):
-        self._init_data["sample_interval"] = c_double(T)
+        self._init_data["sample_interval"] = T if isinstance(T, c_double) else c_double(T)
 
     sample_interval = property(
         _getSampleInterval,
@@ -209,11 +321,81 @@ class AMIModelInitializer:
         return float(self._init_data["bit_time"].value)
 
     def _setBitTime(self, T):
-        self._init_data["bit_time"] = c_double(T)
+        self._init_data["bit_time"] = T if isinstance(T, c_double) else c_double(T)
 
     bit_time = property(_getBitTime, _setBitTime, doc="Link unit interval.")
 
 
+def _sexpr(pname, pval):
+    """Create an S-expression from a parameter name/value pair, calling
+    recursively as needed to elaborate sub-parameter dictionaries.
+
+    Args:
+        pname (str): The parameter name.
+        pval (Any): The parameter value, or a dictionary of sub-parameters.
+
+    Returns:
+        str: The S-expression, with the sub-parameters of each branch joined just once.
+    """
+    if isinstance(pval, dict):
+        return f"({pname} {' '.join(_sexpr(sname, sval) for sname, sval in pval.items())})"
+    return f"({pname} {pval})"
+
+
+@lru_cache(maxsize=None)
+def _bind_ami_funcs(filename):
+    """Load a model's DLL/SO and bind its AMI functions, just once per process.
+
+    Args:
+        filename (str): The DLL/SO file name.
+
+    Returns:
+        (AMI_Init, AMI_GetWave, AMI_Close): The bound AMI functions.
+            ``AMI_GetWave`` is None, if the model doesn't provide it.
+
+    Raises:
+        OSError: If given file cannot be opened.
+
+    Notes:
+        1. The functions are shared by all ``AMIModel`` instances using the same file,
+            which saves re-loading the DLL/SO and re-resolving its symbols, during parameter sweeps.
+            (The operating system's loader shares a single copy of the library between them, regardless.)
+    """
+    my_dll = CDLL(filename)
+    # Declare the AMI function signatures, once, so that ctypes needn't infer argument types on every call.
+    # (The model's memory handle is an opaque pointer, which we hold in a ``c_void_p``.)
+    ami_init = my_dll.AMI_Init
+    ami_init.argtypes = [
+        POINTER(c_double),  # impulse_matrix
+        c_long,  # row_size
+        c_long,  # aggressors
+        c_double,  # sample_interval
+        c_double,  # bit_time
+        c_char_p,  # AMI_parameters_in
+        POINTER(c_char_p),  # AMI_parameters_out
+        POINTER(c_void_p),  # AMI_memory_handle
+        POINTER(c_char_p),  # msg
+    ]
+    ami_init.restype = c_long
+    ami_close = my_dll.AMI_Close
+    ami_close.argtypes = [c_void_p]
+    ami_close.restype = c_long
+    try:
+        ami_get_wave = my_dll.AMI_GetWave
+    except Exception:  # pylint: disable=broad-exception-caught
+        ami_get_wave = None
+    else:
+        ami_get_wave.argtypes = [
+            POINTER(c_double),  # wave
+            c_long,  # wave_size
+            POINTER(c_double),  # clock_times
+            POINTER(c_char_p),  # AMI_parameters_out
+            c_void_p,  # AMI_memory
+        ]
+        ami_get_wave.restype = c_long
+    return (ami_init, ami_get_wave, ami_close)
+
+
 class AMIModel:  # pylint: disable=too-many-instance-attributes
     """
     Class defining the structure and behavior of an IBIS-AMI Model.
@@ -234,14 +416,12 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             OSError: If given file cannot be opened.
         """
 
-        self._ami_mem_handle = None
-        my_dll = CDLL(filename)
-        self._amiInit = my_dll.AMI_Init
-        self._amiClose = my_dll.AMI_Close
-        try:
-            self._amiGetWave = my_dll.AMI_GetWave
-        except Exception:  # pylint: disable=broad-exception-caught
-            self._amiGetWave = None  # type: ignore
+        # The handles written to by the model are allocated just once, and reset in place by ``initialize()``.
+        self._ami_params_out = c_char_p(b"")
+        self._ami_mem_handle = c_void_p(None)
+        self._msg = c_char_p(b"")
+        self._getwave_buffers = None
+        self._amiInit, self._amiGetWave, self._amiClose = _bind_ami_funcs(filename)
 
     def __del__(self):
         """
@@ -262,6 +442,10 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
         Args:
             init_object: The model initialization data.
 
+        Raises:
+            ValueError: If the channel response doesn't hold exactly
+                ``row_size * (num_aggressors + 1)`` samples.
+
         Notes:
             * Takes an instance of ``AMIModelInitializer`` as its only argument.
               This allows model initialization data to be constructed once,
@@ -269,31 +453,30 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
               ``initialize``. This is useful for *PyLab* command prompt testing.
         """
 
+        # ``AMI_Init()`` reads and writes ``row_size * (num_aggressors + 1)`` doubles, so check the response size.
+        init_data = init_object._init_data  # pylint: disable=protected-access
+        channel_response = np.ascontiguousarray(init_data["channel_response"], dtype=np.float64)
+        row_size = init_data["row_size"]
+        num_aggressors = init_data["num_aggressors"]
+        if channel_response.size != row_size * (num_aggressors + 1):
+            raise ValueError(
+                f"Channel response has {channel_response.size} samples, but `row_size` ({row_size}) "
+                f"and `num_aggressors` ({num_aggressors}) call for {row_size * (num_aggressors + 1)}!"
+            )
+
         # Free any memory allocated by the previous initialization.
         if self._ami_mem_handle:
             self._amiClose(self._ami_mem_handle)
+            self._ami_mem_handle.value = None
 
         # Set up the AMI_Init() arguments.
-        self._channel_response = (
-            init_object._init_data[  # pylint: disable=protected-access,attribute-defined-outside-init
-                "channel_response"
-            ]
-        )
-        self._initOut = cp.copy(self._channel_response)  # type: ignore  # pylint: disable=attribute-defined-outside-init
-        self._row_size = init_object._init_data[  # pylint: disable=protected-access,attribute-defined-outside-init
-            "row_size"
-        ]
-        self._num_aggressors = init_object._init_data[
-            "num_aggressors"
-        ]  # pylint: disable=protected-access,attribute-defined-outside-init
-        self._sample_interval = (
-            init_object._init_data[  # pylint: disable=protected-access,attribute-defined-outside-init
-                "sample_interval"
-            ]
-        )
-        self._bit_time = init_object._init_data[  # pylint: disable=protected-access,attribute-defined-outside-init
-            "bit_time"
-        ]
+        # (The channel response is copied just once, with a single bulk copy, into the buffer the model writes to.)
+        self._channel_response = channel_response  # pylint: disable=attribute-defined-outside-init
+        self._initOut = self._channel_response.copy()  # pylint: disable=attribute-defined-outside-init
+        self._row_size = row_size  # pylint: disable=attribute-defined-outside-init
+        self._num_aggressors = num_aggressors  # pylint: disable=attribute-defined-outside-init
+        self._sample_interval = init_data["sample_interval"]  # pylint: disable=attribute-defined-outside-init
+        self._bit_time = init_data["bit_time"]  # pylint: disable=attribute-defined-outside-init
         self._info_params = init_object.info_params  # pylint: disable=attribute-defined-outside-init
         assert self._info_params, RuntimeError(
             f"`info_params` is None!\n`init_object: {init_object}"
@@ -306,37 +489,26 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             )
 
         # Construct the AMI parameters string.
-        def sexpr(pname, pval):
-            """Create an S-expression from a parameter name/value pair, calling
-            recursively as needed to elaborate sub-parameter dictionaries."""
-            if isinstance(pval, dict):
-                subs = []
-                for sname in pval:
-                    subs.append(sexpr(sname, pval[sname]))
-                return sexpr(pname, " ".join(subs))
-            return f"({pname} {pval})"
-
-        ami_params_in = f"({init_object.ami_params['root_name']} "
-        for item in list(init_object.ami_params.items()):
-            if not item[0] == "root_name":
-                ami_params_in += sexpr(item[0], item[1])
-        ami_params_in += ")"
+        params_in = "".join(
+            _sexpr(pname, pval) for pname, pval in init_object.ami_params.items() if pname != "root_name"
+        )
+        ami_params_in = f"({init_object.ami_params['root_name']} {params_in})"
         self._ami_params_in = ami_params_in.encode("utf-8")  # pylint: disable=attribute-defined-outside-init
 
-        # Set handle types.
-        self._ami_params_out = c_char_p(b"")  # pylint: disable=attribute-defined-outside-init
-        self._ami_mem_handle = c_char_p(None)  # type: ignore  # pylint: disable=attribute-defined-outside-init
-        self._msg = c_char_p(b"")  # pylint: disable=attribute-defined-outside-init
+        # Reset the strings returned by the model.
+        self._ami_params_out.value = b""
+        self._msg.value = b""
 
         # Call AMI_Init(), via our Python wrapper.
         try:
             self._amiInit(
-                byref(self._initOut),  # type: ignore
+                self._initOut.ctypes.data_as(POINTER(c_double)),
                 self._row_size,
                 self._num_aggressors,
                 self._sample_interval,
                 self._bit_time,
-                self._ami_params_in,  # Prevents model from mucking up our input parameter string.
+                # A private, writable copy, which prevents the model from mucking up our input parameter string.
+                create_string_buffer(self._ami_params_in),
                 byref(self._ami_params_out),
                 byref(self._ami_mem_handle),  # type: ignore
                 byref(self._msg),
@@ -346,7 +518,7 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             print(err)
             print(f"AMI_Init() address = {self._amiInit}")
             print("Values sent into AMI_Init():")
-            print(f"&initOut = {byref(self._initOut)}")  # type: ignore
+            print(f"&initOut = {self._initOut.ctypes.data:#x}")
             print(f"row_size = {self._row_size}")
             print(f"num_aggressors = {self._num_aggressors}")
             print(f"sample_interval = {self._sample_interval}")
@@ -356,6 +528,14 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             print(f"&ami_mem_handle = {byref(self._ami_mem_handle)}")  # type: ignore
             print(f"&msg = {byref(self._msg)}")
             raise err
+        # Copy the returned strings just once, rather than on every property access.
+        self._ami_params_out_value = self._ami_params_out.value  # pylint: disable=attribute-defined-outside-init
+        self._msg_value = self._msg.value  # pylint: disable=attribute-defined-outside-init
+        # Likewise, wrap the responses just once, now that the model is done writing to them.
+        self._initOut_view = _read_only_view(self._initOut)  # pylint: disable=attribute-defined-outside-init
+        self._channel_response_view = (  # pylint: disable=attribute-defined-outside-init
+            _read_only_view(self._channel_response)
+        )
 
         # Initialize attributes used by getWave().
         bit_time = init_object.bit_time
@@ -368,8 +548,32 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             )
         self._samps_per_bit = int(bit_time / sample_interval)  # pylint: disable=attribute-defined-outside-init
         self._bits_per_call = (  # pylint: disable=attribute-defined-outside-init
-            init_object.row_size / self._samps_per_bit
+            int(init_object.row_size) // self._samps_per_bit
         )
+        self._getClockTimesBuffer(self._bits_per_call)
+
+    def _getClockTimesBuffer(self, bits_per_call: int):
+        """
+        Fetch the clock times buffer shared with ``AMI_GetWave()``, along with a pointer to it,
+        allocating it only when the number of bits per call changes.
+
+        Args:
+            bits_per_call: Number of bits to use, per call to ``AMI_GetWave()``.
+
+        Returns:
+            (clock_times_buf, clock_times_ptr): The clock times buffer,
+            and a pointer to it, suitable for passing to ``AMI_GetWave()``.
+        """
+
+        if self._getwave_buffers is None or self._getwave_buffers[0] != bits_per_call:
+            # The "+1" is critical, to prevent access violations by the model.
+            clock_times_buf = np.zeros(bits_per_call + 1)
+            self._getwave_buffers = (
+                bits_per_call,
+                clock_times_buf,
+                clock_times_buf.ctypes.data_as(POINTER(c_double)),
+            )
+        return self._getwave_buffers[1:]
 
     def getWave(self, wave: Rvec, bits_per_call: int = 0) -> tuple[Rvec, Rvec, list[str]]:  # noqa: F405
         """
@@ -389,43 +593,99 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
                 - the recovered slicer sampling instants, and
                 - the list of output parameter strings received from each call to ``AMI_GetWave()``.
 
+        Raises:
+            RuntimeError: If the model doesn't provide ``AMI_GetWave()``.
+
         Notes:
             1. The returned clock times are given in "pre-edge-aligned" fashion,
                 which means their values are: sampling instant - ui/2.
+            2. ``wave`` is left untouched; the model processes a copy of it.
+                Use ``getWaveInPlace()`` to avoid that copy.
         """
 
+        return self.getWaveInPlace(np.array(wave, dtype=np.float64), bits_per_call=bits_per_call)
+
+    def getWaveInPlace(self, wave: Rvec, bits_per_call: int = 0) -> tuple[Rvec, Rvec, list[str]]:  # noqa: F405
+        """
+        Performs time domain processing of input waveform, in place, using the
+        ``AMI_GetWave()`` function.
+
+        The model reads from, and writes to, ``wave`` directly, chunk by chunk,
+        so that no copies of the waveform are made.
+        Simulators processing many blocks may preallocate ``wave`` once, and reuse it for each block.
+
+        Args:
+            wave: Waveform to be processed, which gets overwritten with the processed waveform.
+                Must be a writable, C-contiguous, one dimensional *NumPy* array of float64.
+
+        Keyword Args:
+            bits_per_call: Number of bits to use, per call to ``AMI_GetWave()``.
+                Default: 0 (Means "Use existing value.")
+
+        Returns:
+            (wave, clock_times, params_out): A tuple containing:
+                - ``wave``, now holding the processed waveform,
+                - the recovered slicer sampling instants, and
+                - the list of output parameter strings received from each call to ``AMI_GetWave()``.
+
+        Raises:
+            RuntimeError: If the model doesn't provide ``AMI_GetWave()``.
+            ValueError: If ``wave`` isn't a suitable *NumPy* array.
+
+        Notes:
+            1. The returned clock times are given in "pre-edge-aligned" fashion,
+                which means their values are: sampling instant - ui/2.
+        """
+
+        if self._amiGetWave is None:
+            raise RuntimeError("This model doesn't provide `AMI_GetWave()`!")
+        if not (
+            isinstance(wave, np.ndarray)
+            and wave.dtype == np.float64  # noqa: W503
+            and wave.ndim == 1  # noqa: W503
+            and wave.flags.c_contiguous  # noqa: W503
+            and wave.flags.writeable  # noqa: W503
+        ):
+            raise ValueError("`wave` must be a writable, C-contiguous, 1-D NumPy array of float64!")
         if bits_per_call:
             self._bits_per_call = int(bits_per_call)  # pylint: disable=attribute-defined-outside-init
-        bits_per_call = int(self._bits_per_call)
-        samps_per_call = int(self._samps_per_bit * bits_per_call)
+        bits_per_call = self._bits_per_call
+        samps_per_call = self._samps_per_bit * bits_per_call
 
-        # Create the required C types.
-        Signal = c_double * samps_per_call
-        Clocks = c_double * (bits_per_call + 1)  # The "+1" is critical, to prevent access violations by the model.
+        # Hand the model pointers into the waveform itself, and to a clock times buffer reused from call to call,
+        # so that no per-sample conversion to/from C types is needed.
+        _clock_times, clock_times_ptr = self._getClockTimesBuffer(bits_per_call)
+        _clock_times.fill(0.0)
+        wave_addr = wave.ctypes.data
 
-        idx = 0  # Holds the starting index of the next processing chunk.
-        _clock_times = Clocks(0.0)
-        wave_out: list[float] = []
-        clock_times: list[float] = []
-        params_out: list[str] = []
+        # Preallocate the clock times output, which gets filled in by slice, chunk by chunk.
         input_len = len(wave)
+        num_calls = -(-input_len // samps_per_call)
+        clock_times = np.empty(num_calls * len(_clock_times))
+        params_out: list[str] = []
+
+        idx = 0  # Holds the starting index of the next processing chunk.
+        clk_idx = 0  # Holds the starting index of the next chunk's clock times.
         while idx < input_len:
-            remaining_samps = input_len - idx
-            if remaining_samps < samps_per_call:
-                Signal = c_double * remaining_samps
-                tmp_wave = wave[idx:]
-            else:
-                tmp_wave = wave[idx : idx + samps_per_call]
-            _wave = Signal(*tmp_wave)
+            nsamps = min(samps_per_call, input_len - idx)
             self._amiGetWave(
-                byref(_wave), len(_wave), byref(_clock_times), byref(self._ami_params_out), self._ami_mem_handle
+                cast(wave_addr + idx * wave.itemsize, POINTER(c_double)),
+                nsamps,
+                clock_times_ptr,
+                byref(self._ami_params_out),
+                self._ami_mem_handle,
             )  # type: ignore
-            wave_out.extend(_wave)
-            clock_times.extend(_clock_times)
-            params_out.append(self.ami_params_out)
-            idx += len(_wave)
-
-        return np.array(wave_out), np.array(clock_times[: len(wave_out) // self._samps_per_bit]), params_out
+            clock_times[clk_idx : clk_idx + len(_clock_times)] = _clock_times
+            params_out.append(self._ami_params_out.value)
+            idx += nsamps
+            clk_idx += len(_clock_times)
+        if params_out:
+            self._ami_params_out_value = params_out[-1]  # pylint: disable=attribute-defined-outside-init
+
+        self._clock_times = (  # pylint: disable=attribute-defined-outside-init
+            clock_times[: input_len // self._samps_per_bit]
+        )
+        return wave, self._clock_times, params_out
 
     def get_responses(  # pylint: disable=too-many-locals
         self,
@@ -477,8 +737,8 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
         # ignore_bits = info_params["Ignore_Bits"] if "Ignore_Bits" in info_params else 0
 
         # Capture/convert instance variables.
-        chnl_imp = np.array(self.channel_response) * ts  # input (a.k.a. - "channel") impulse response (V/sample)
-        out_imp = np.array(self.initOut) * ts  # output impulse response (V/sample)
+        chnl_imp = self.channel_response * ts  # input (a.k.a. - "channel") impulse response (V/sample)
+        out_imp = self.initOut * ts  # output impulse response (V/sample)
 
         # Calculate some needed intermediate values.
         nspui = int(ui / ts)  # samps per UI
@@ -500,8 +760,8 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             # _, _, _ = self.getWave(np.array(wave_in) - 0.5, bits_per_call=bits_per_call)
 
             # Then, run a perfect step, to extract model's step response.
-            wave_out, _, _ = self.getWave(
-                np.array([0] * pad_samps + [1] * impulse_length) - 0.5,
+            wave_out, _, _ = self.getWaveInPlace(
+                np.repeat([-0.5, 0.5], [pad_samps, impulse_length]),
                 bits_per_call=bits_per_call,
             )
 
@@ -513,7 +773,7 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
             chnl_step = np.cumsum(chnl_imp)
             # - And run it through `GetWave()`, after d.c. balancing.
             chnl_step_bal = chnl_step - chnl_step[-1] / 2
-            out_step, _, _ = self.getWave(
+            out_step, _, _ = self.getWaveInPlace(
                 np.pad(chnl_step_bal, (pad_samps, 0), mode="edge"), bits_per_call=bits_per_call
             )
             # - Convert result back to an impulse response.
@@ -521,14 +781,18 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
         return rslt
 
     def _getInitOut(self):
-        return list(map(float, self._initOut))
+        return self._initOut_view
 
-    initOut = property(_getInitOut, doc="Channel response convolved with model impulse response.")
+    initOut = property(
+        _getInitOut, doc="Channel response convolved with model impulse response. (A read-only *NumPy* array.)"
+    )
 
     def _getChannelResponse(self):
-        return list(map(float, self._channel_response))
+        return self._channel_response_view
 
-    channel_response = property(_getChannelResponse, doc="Channel response passed to initialize().")
+    channel_response = property(
+        _getChannelResponse, doc="Channel response passed to initialize(). (A read-only *NumPy* array.)"
+    )
 
     def _getRowSize(self):
         return self._row_size
@@ -558,19 +822,19 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
     ami_params_in = property(_getAmiParamsIn, doc="The AMI parameter string passed to AMI_Init() by initialize().")
 
     def _getAmiParamsOut(self):
-        return self._ami_params_out.value
+        return self._ami_params_out_value
 
     ami_params_out = property(
         _getAmiParamsOut, doc="The AMI parameter string returned by either `AMI_Init()` or `AMI_GetWave()`."
     )
 
     def _getMsg(self):
-        return self._msg.value
+        return self._msg_value
 
     msg = property(_getMsg, doc="Message returned by most recent call to AMI_Init() or AMI_GetWave().")
 
     def _getClockTimes(self):
-        return self.clock_times
+        return self._clock_times
 
     clock_times = property(_getClockTimes, doc="Clock times returned by most recent call to getWave().")
 
@@ -578,3 +842,44 @@ class AMIModel:  # pylint: disable=too-many-instance-attributes
         return self._info_params
 
     info_params = property(_getInfoParams, doc="Reserved AMI parameter values for this model.")
+
+
+def process_lanes(
+    models: list[AMIModel], waves: list[Rvec], bits_per_call: int = 0  # noqa: F405
+) -> list[tuple[Rvec, Rvec, list[str]]]:  # noqa: F405
+    """
+    Run several independent lanes through their models' ``AMI_GetWave()`` functions, concurrently.
+
+    Args:
+        models: One initialized model per lane.
+        waves: One input waveform per lane.
+
+    Keyword Args:
+        bits_per_call: Number of bits to use, per call to ``AMI_GetWave()``.
+            Default: 0 (Means "Use existing value.")
+
+    Returns:
+        The results of ``getWave()``, for each lane, in order.
+
+    Raises:
+        ValueError: If the numbers of models and waves differ, or a model is used for more than one lane.
+
+    Notes:
+        1. *ctypes* releases the GIL for the duration of each call into the model,
+            so the lanes really do run in parallel.
+        2. A model instance holds the state of a single lane,
+            and so must not be shared between lanes.
+            (The model's DLL/SO must also keep all of its state in its memory handle,
+            not in global variables, and be safe to call from several threads at once.)
+    """
+
+    if len(models) != len(waves):
+        raise ValueError(f"Got {len(models)} models, but {len(waves)} waves!")
+    if len({id(model) for model in models}) != len(models):
+        raise ValueError("Each lane needs its own model instance!")
+    if not models:
+        return []
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        return list(
+            executor.map(lambda model, wave: model.getWave(wave, bits_per_call=bits_per_call), models, waves)
+        )
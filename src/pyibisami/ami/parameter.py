@@ -7,6 +7,8 @@ Original date:   December 24, 2016
 Copyright (c) 2019 David Banas; all rights reserved World wide.
 """
 
+import numpy as np
+
 #####
 # AMI parameter
 #####
@@ -282,14 +284,16 @@ class AMIParameter:  # pylint: disable=too-many-instance-attributes,too-few-publ
         # (Any errors encountered will prevent initialization from completing.)
         self._msg = ""
 
-        # Process all parameter definition tags.
+        # Process all parameter definition tags, ignoring any we don't recognize.
+        tag_procs = self._param_def_tag_procs
         for tag in tags:
-            tag_name = tag[0]
-            if tag_name in self._param_def_tag_procs:
-                try:
-                    self._param_def_tag_procs[tag_name](self, tag[1])
-                except AMIParamError as err:
-                    raise AMIParamError(f"Problem initializing parameter, '{name}': {err}\n") from err
+            tag_proc = tag_procs.get(tag[0])
+            if tag_proc is None:
+                continue
+            try:
+                tag_proc(self, tag[1])
+            except AMIParamError as err:
+                raise AMIParamError(f"Problem initializing parameter, '{name}': {err}\n") from err
 
         # Validate and complete the instance.
         # Check for required tags.
@@ -345,27 +349,25 @@ class AMIParameter:  # pylint: disable=too-many-instance-attributes,too-few-publ
                 raise AMIParamError(f"Insufficient number of values, {len(vals)}, provided for Range.\n")
             if param_type in ("Float", "UI"):
                 try:
-                    temp_vals = list(map(float, vals[:3]))
-                except (ValueError, TypeError) as exc:
+                    temp_vals = np.asarray(vals[:3], dtype=np.float64)
+                except (ValueError, TypeError, OverflowError) as exc:
                     raise AMIParamError(f"Couldn't read floats from '{vals[:3]}'.\n") from exc
             else:
                 try:
-                    temp_vals = list(map(int, vals[:3]))
-                except (ValueError, TypeError) as exc:
+                    temp_vals = np.asarray(vals[:3], dtype=np.int64)
+                except (ValueError, TypeError, OverflowError) as exc:
                     raise AMIParamError(f"Couldn't read integers from '{vals[:3]}'.\n") from exc
-            self._value = temp_vals[0]
-            self._min = temp_vals[1]
-            self._max = temp_vals[2]
+            self._value, self._min, self._max = temp_vals.tolist()
         else:  # param_format == 'List'
             if param_type in ("Float", "UI"):
                 try:
-                    temp_vals = list(map(float, vals))
-                except (ValueError, TypeError) as exc:
+                    temp_vals = np.asarray(vals, dtype=np.float64).tolist()
+                except (ValueError, TypeError, OverflowError) as exc:
                     raise AMIParamError(f"Couldn't read floats from '{vals}'.\n") from exc
             elif param_type in ("Integer", "Tap"):
                 try:
-                    temp_vals = list(map(int, vals))
-                except (ValueError, TypeError) as exc:
+                    temp_vals = np.asarray(vals, dtype=np.int64).tolist()
+                except (ValueError, TypeError, OverflowError) as exc:
                     raise AMIParamError(f"Couldn't read integers from '{vals}'.\n") from exc
             else:  # 'param_type' == 'String'
                 try:
@@ -376,3 +378,9 @@ class AMIParameter:  # pylint: disable=too-many-instance-attributes,too-few-publ
             self._value = temp_vals
 
         self._name = name
+
+    def __copy__(self):
+        """Copy the parameter, without sharing any of its (mutable) lists."""
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__ = {attr: (val.copy() if isinstance(val, list) else val) for attr, val in self.__dict__.items()}
+        return new
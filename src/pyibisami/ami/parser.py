@@ -8,8 +8,10 @@ Copyright (c) 2019 David Banas; all rights reserved World wide.
 """
 
 import re
+import sys
+from copy import copy
+from functools import lru_cache
 
-from parsec import ParseError, generate, many, regex, string
 from traits.api import Bool, Enum, HasTraits, Range, Trait
 from traitsui.api import Group, Item, View
 from traitsui.menu import ModalButtons
@@ -72,7 +74,7 @@ class AMIParamConfigurator(HasTraits):
             print("Empty dictionary returned by parse_ami_param_defs()!")
             print(f"Error message:\n{err_str}")
             raise KeyError("Failed to parse AMI file; see console for more detail.")
-        top_branch = list(param_dict.items())[0]
+        top_branch = next(iter(param_dict.items()))
         param_dict = top_branch[1]
         if "Reserved_Parameters" not in param_dict:
             print(f"Error: {err_str}\nParameters: {param_dict}")
@@ -89,12 +91,22 @@ class AMIParamConfigurator(HasTraits):
             trait_names.append(trait[0])
         self._content = gui_items
         self._param_trait_names = trait_names
+        self._mapped_traits = {name for name in trait_names if self.trait(name).is_mapped}
+        self._input_ami_params = None  # Cached by ``input_ami_params``, until the user changes something.
+        self.observe(self._forget_input_ami_params, trait_names)
         self._root_name = top_branch[0]
         self._ami_parsing_errors = err_str
         self._content = gui_items
+        self._view = View(
+            resizable=False,
+            buttons=ModalButtons,
+            title="PyBERT AMI Parameter Configurator",
+            id="pybert.pybert_ami.param_config",
+        )
+        self._view.set_content(gui_items)
         self._param_dict = param_dict
         try:
-            self._info_dict = {name: p.pvalue for (name, p) in list(param_dict["Reserved_Parameters"].items())}
+            self._info_dict = {name: p.pvalue for (name, p) in param_dict["Reserved_Parameters"].items()}
         except Exception as err:
             print(f"{err}")
             print(f"param_dict['Reserved_Parameters']: {param_dict['Reserved_Parameters']}")
@@ -110,30 +122,21 @@ class AMIParamConfigurator(HasTraits):
 
     def default_traits_view(self):
         "Default Traits/UI view definition."
-        view = View(
-            resizable=False,
-            buttons=ModalButtons,
-            title="PyBERT AMI Parameter Configurator",
-            id="pybert.pybert_ami.param_config",
-        )
-        view.set_content(self._content)
-        return view
+        return self._view
 
     def fetch_param(self, branch_names):
         """Returns the parameter found by traversing 'branch_names' or None if
         not found.
 
-        Note: 'branch_names' should *not* begin with 'root_name'.
+        Note: 'branch_names' (any sequence; it is left unchanged) should *not* begin with 'root_name'.
         """
-        param_dict = self.ami_param_defs
-        while branch_names:
-            branch_name = branch_names.pop(0)
-            if branch_name in param_dict:
-                param_dict = param_dict[branch_name]
-            else:
+        param = self.ami_param_defs
+        for branch_name in branch_names:
+            if not isinstance(param, dict):
                 return None
-        if isinstance(param_dict, AMIParameter):
-            return param_dict
+            param = param.get(branch_name)
+        if isinstance(param, AMIParameter):
+            return param
         return None
 
     def fetch_param_val(self, branch_names):
@@ -156,8 +159,7 @@ class AMIParamConfigurator(HasTraits):
         """
 
         param_dict = self.ami_param_defs
-        while branch_names:
-            branch_name = branch_names.pop(0)
+        for branch_name in branch_names:
             if branch_name in param_dict:
                 param_dict = param_dict[branch_name]
             else:
@@ -166,10 +168,14 @@ class AMIParamConfigurator(HasTraits):
                 )
         if isinstance(param_dict, AMIParameter):
             param_dict.pvalue = new_val
-            try:
-                eval(f"self.set({branch_name}_={new_val})")  # pylint: disable=eval-used
-            except Exception:  # pylint: disable=broad-exception-caught
-                eval(f"self.set({branch_name}={new_val})")  # pylint: disable=eval-used
+            self._input_ami_params = None
+            if branch_name in self._mapped_traits:  # Select the list tip that maps to the new value.
+                for tip, val in self.trait(branch_name).handler.map.items():
+                    if val == new_val:
+                        self.trait_set(**{branch_name: tip})
+                        break
+            elif branch_name in self._param_trait_names:
+                self.trait_set(**{branch_name: new_val})
         else:
             raise TypeError(f"{param_dict} is not of type: AMIParameter!")
 
@@ -194,12 +200,18 @@ class AMIParamConfigurator(HasTraits):
 
         Should be passed to ``AMIModelInitializer`` constructor.
         """
-        res = {}
-        res["root_name"] = self._root_name
-        params = self.ami_param_defs["Model_Specific"]
-        for pname in params:
-            res.update(self.input_ami_param(params, pname))
-        return res
+        if self._input_ami_params is None:
+            res = {}
+            res["root_name"] = self._root_name
+            params = self.ami_param_defs["Model_Specific"]
+            for pname in params:
+                res.update(self.input_ami_param(params, pname))
+            self._input_ami_params = res
+        return _copy_dicts(self._input_ami_params)
+
+    def _forget_input_ami_params(self, event):  # pylint: disable=unused-argument
+        "Discard the cached ``input_ami_params``, when a parameter trait changes."
+        self._input_ami_params = None
 
     def input_ami_param(self, params, pname):
         """Retrieve one AMI parameter, or dictionary of subparameters."""
@@ -208,12 +220,10 @@ class AMIParamConfigurator(HasTraits):
         if isinstance(param, AMIParameter):
             if pname in self._param_trait_names:  # If model specific and In or InOut...
                 # See the docs on the *HasTraits* class, if this is confusing.
-                try:  # Querry for a mapped trait, first, by trying to get '<trait_name>_'. (Note the underscore.)
-                    res[pname] = self.get(pname + "_")[pname + "_"]
-                except (
-                    Exception  # pylint: disable=broad-exception-caught
-                ):  # If we get an exception, we have an ordinary (i.e. - not mapped) trait.
-                    res[pname] = self.get(pname)[pname]
+                if pname in self._mapped_traits:  # Mapped traits keep their value in '<trait_name>_'.
+                    res[pname] = getattr(self, pname + "_")
+                else:
+                    res[pname] = getattr(self, pname)
         elif isinstance(param, dict):  # We received a dictionary of subparameters, in 'param'.
             subs = {}
             for sname in param.keys():
@@ -227,61 +237,99 @@ class AMIParamConfigurator(HasTraits):
         return self._info_dict
 
 
+def _copy_dicts(tree):
+    "Copy a tree of nested dictionaries, sharing only the leaves."
+    return {key: (_copy_dicts(val) if isinstance(val, dict) else val) for key, val in tree.items()}
+
+
 #####
 # AMI file parser.
 #####
 
-# ignore cases.
-whitespace = regex(r"\s+", re.MULTILINE)
-comment = regex(r"\|.*")
-ignore = many(whitespace | comment)
+# Tokens.
+_SKIP_RE = re.compile(r"(?:\s+|\|[^\n]*)*")  # whitespace and/or comments
+_SYMBOL_PATTERN = r"[0-9a-zA-Z_][^\s()]*"
+_SYMBOL_RE = re.compile(_SYMBOL_PATTERN)
+_NUMBER_PATTERN = r"[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?"
+# Order matters: "27abc" is the number "27", followed by the symbol "abc".
+_ATOM_RE = re.compile(rf'{_NUMBER_PATTERN}|{_SYMBOL_PATTERN}|"[^"]*"')
+
+
+def _parse_node(text, index):
+    """Parse the AMI node, ``(<label> <expr>*)``, beginning at ``index``.
 
+    An ``<expr>`` is either an atom (number, symbol, or quoted string) or a nested node.
+    A nested node that fails to parse simply ends the list of expressions,
+    leaving the closing parenthesis check to report the failure.
 
-def lexeme(p):
-    """Lexer for words."""
-    return p << ignore  # skip all ignored characters.
+    Args:
+        text (str): The text being parsed.
+        index (int): The position of the opening parenthesis.
 
+    Returns:
+        (bool, Any, int): A triple containing:
+            success: True, if a node was parsed.
+            result: The ``(label, values)`` pair parsed, on success;
+                a description of what was expected, on failure.
+            index: The position of the next token, on success;
+                the position of the failure, otherwise.
+    """
+    if not text.startswith("(", index):
+        return (False, "AMI node", index)
+    index = _SKIP_RE.match(text, index + 1).end()
+    match = _SYMBOL_RE.match(text, index)
+    if not match:
+        return (False, _SYMBOL_PATTERN, index)
+    label = sys.intern(match.group())  # Labels repeat a lot; make their dictionary lookups cheap.
+    index = _SKIP_RE.match(text, match.end()).end()
+    values = []
+    while True:
+        if text.startswith("(", index):  # No atom begins with a parenthesis.
+            success, value, index_next = _parse_node(text, index)
+            if not success:
+                break
+            values.append(value)
+            index = index_next
+        else:
+            match = _ATOM_RE.match(text, index)
+            if not match:
+                break
+            values.append(match.group())
+            index = _SKIP_RE.match(text, match.end()).end()
+    if not text.startswith(")", index):
+        return (False, ")", index)
+    return (True, (label, values), _SKIP_RE.match(text, index + 1).end())
 
-def int2tap(x):
-    """Convert integer to tap position."""
-    x = x.strip()
-    if x[0] == "-":
-        res = "pre" + x[1:]
-    else:
-        res = "post" + x
-    return res
 
+# Parameter definition tags (e.g. - "Usage", "Type", etc.).
+_TAG_PROCS = frozenset(AMIParameter._param_def_tag_procs)  # pylint: disable=protected-access
+_RESERVED_PARAM_NAMES = frozenset(AMIParameter.RESERVED_PARAM_NAMES)
 
-lparen = lexeme(string("("))
-rparen = lexeme(string(")"))
-number = lexeme(regex(r"[-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?"))
-integ = lexeme(regex(r"[-+]?[0-9]+"))
-nat = lexeme(regex(r"[0-9]+"))
-tap_ix = (integ << whitespace).parsecmap(int2tap)
-symbol = lexeme(regex(r"[0-9a-zA-Z_][^\s()]*"))
-true = lexeme(string("True")).result(True)
-false = lexeme(string("False")).result(False)
-ami_string = lexeme(regex(r'"[^"]*"'))
 
-atom = number | symbol | ami_string | (true | false)
-node_name = tap_ix ^ symbol  # `tap_ix` is new and gives the tap position; negative positions are allowed.
+def _freeze(item):
+    """Convert a parsed AMI node into a hashable equivalent, using tuples in place of lists."""
+    if isinstance(item, tuple):
+        return (item[0], tuple(map(_freeze, item[1])))
+    return item
 
 
-@generate("AMI node")
-def node():
-    "Parse AMI node."
-    yield lparen
-    label = yield node_name
-    values = yield many(expr)
-    yield rparen
-    return (label, values)
+def _thaw(item):
+    """Undo ``_freeze()``."""
+    if isinstance(item, tuple):
+        return (item[0], list(map(_thaw, item[1])))
+    return item
 
 
-expr = atom | node
-ami_defs = ignore >> node
+@lru_cache(maxsize=4096)
+def _build_ami_param(name, tags_key):
+    """Build the AMI parameter defined by a frozen tag list, remembering it for reuse.
+
+    Note: The parameter returned is shared; copy it before handing it out.
+    """
+    return AMIParameter(name, list(map(_thaw, tags_key)))
 
 
-def proc_branch(branch):
+def proc_branch(branch):  # pylint: disable=too-many-branches,too-many-statements
     """Process a branch in a AMI parameter definition tree.
 
     That is, build a dictionary from a pair containing:
@@ -297,6 +345,9 @@ def proc_branch(branch):
     tag and the fact that we have no guarantee of any particular
     ordering of subparameter branch items.
 
+    Subparameters are processed using an explicit stack, rather than
+    recursion, to keep deep parameter trees cheap.
+
     Args:
         p (str, list): A pair, as described above.
 
@@ -306,54 +357,65 @@ def proc_branch(branch):
                 while building the parameter dictionary.
             param_dict: Resultant parameter dictionary.
     """
-    results = ("", {})  # Empty Results
-    if len(branch) != 2:
-        if not branch:
-            err_str = "ERROR: Empty branch provided to proc_branch()!\n"
+    stack = []  # Branches awaiting their subparameters: [name, tags, remaining tags, dict, err_str, fallback]
+    while True:
+        if len(branch) < 2 and stack:
+            # A malformed subparameter (e.g. - a bare word) abandons its parent,
+            # which falls back on any errors found so far.
+            param_name, param_tags, _, param_dict, err_str, results = stack.pop()
+            print(f"Error processing branch:\n{param_tags}")
+            if err_str:
+                results = (err_str, {param_name: param_dict})
         else:
-            err_str = f"ERROR: Malformed item: {branch[0]}\n"
-        results = (err_str, {})
-
-    param_name = branch[0]
-    param_tags = branch[1]
-
-    if not param_tags:
-        err_str = f"ERROR: No tags/subparameters provided for parameter, '{param_name}'\n"
-        results = (err_str, {})
-
-    try:
-        if (
-            (len(param_tags) > 1)
-            and (  # noqa: W503
-                param_tags[0][0] in AMIParameter._param_def_tag_procs  # pylint: disable=protected-access  # noqa: W503
-            )
-            and (  # noqa: W503
-                param_tags[1][0] in AMIParameter._param_def_tag_procs  # pylint: disable=protected-access  # noqa: W503
-            )
-        ):
+            results = ("", {})  # Empty Results
+            if len(branch) != 2:
+                if not branch:
+                    err_str = "ERROR: Empty branch provided to proc_branch()!\n"
+                else:
+                    err_str = f"ERROR: Malformed item: {branch[0]}\n"
+                results = (err_str, {})
+            param_name = branch[0]
+            param_tags = branch[1]
+            if not param_tags:
+                err_str = f"ERROR: No tags/subparameters provided for parameter, '{param_name}'\n"
+                results = (err_str, {})
+
+            # Definition tags and subparameters are both ``(label, values)`` pairs; only their labels differ.
+            # The parameter test comes first: it rejects a subparameter branch with a single probe,
+            # and a *parameter* named "Description" must not be taken for a description.
             try:
-                results = ("", {param_name: AMIParameter(param_name, param_tags)})
-            except AMIParamError as err:
-                results = (str(err), {})
-        elif param_name == "Description":
-            results = ("", {"description": param_tags[0].strip('"')})
+                if len(param_tags) > 1 and param_tags[0][0] in _TAG_PROCS and param_tags[1][0] in _TAG_PROCS:
+                    try:
+                        param = _build_ami_param(param_name, tuple(map(_freeze, param_tags)))
+                        results = ("", {param_name: copy(param)})
+                    except AMIParamError as err:
+                        results = (str(err), {})
+                elif param_name == "Description":
+                    results = ("", {"description": param_tags[0].strip('"')})
+                elif param_tags:
+                    tags = iter(param_tags)
+                    stack.append([param_name, param_tags, tags, {}, "", results])
+                    branch = next(tags)
+                    continue
+                else:
+                    results = ("", {param_name: {}})
+            except Exception:  # pylint: disable=broad-exception-caught
+                print(f"Error processing branch:\n{param_tags}")
+
+        # Hand the results up to the waiting parent branches.
+        while stack:
+            frame = stack[-1]
+            temp_str, temp_dict = results
+            frame[3].update(temp_dict)
+            if temp_str:
+                frame[4] = f"Error returned by recursive call, while processing parameter, '{frame[0]}':\n{temp_str}"
+            branch = next(frame[2], None)
+            if branch is not None:
+                break
+            stack.pop()
+            results = (frame[4], {frame[0]: frame[3]})
         else:
-            err_str = ""
-            param_dict = {}
-            param_dict[param_name] = {}
-            for param_tag in param_tags:
-                temp_str, temp_dict = proc_branch(param_tag)
-                param_dict[param_name].update(temp_dict)
-                if temp_str:
-                    err_str = (
-                        f"Error returned by recursive call, while processing parameter, '{param_name}':\n{temp_str}"
-                    )
-                    results = (err_str, param_dict)
-
-            results = (err_str, param_dict)
-    except Exception:  # pylint: disable=broad-exception-caught
-        print(f"Error processing branch:\n{param_tags}")
-    return results
+            return results
 
 
 def parse_ami_param_defs(param_str):  # pylint: disable=too-many-branches
@@ -398,33 +460,39 @@ def parse_ami_param_defs(param_str):  # pylint: disable=too-many-branches
                     - instances of class *AMIParameter*, or
                     - sub-dictionaries following the same pattern.
     """
-    try:
-        res = ami_defs.parse(param_str)
-    except ParseError as pe:
-        err_str = f"Expected {pe.expected} at {pe.loc()} in:\n{pe.text[pe.index:]}"
+    success, res, index = _parse_node(param_str, _SKIP_RE.match(param_str, 0).end())
+    if not success:
+        line = param_str.count("\n", 0, index)
+        col = index - (param_str.rfind("\n", 0, index) + 1)
+        err_str = f"Expected {res} at {line}:{col} in:\n{param_str[index:index + 80]}"  # Just enough context.
         return err_str, {}
 
     err_str, param_dict = proc_branch(res)
     if err_str:
         return (err_str, {"res": res, "dict": param_dict})
 
+    if not param_dict:
+        return ("ERROR: No parameter definitions found!", {})
+
+    errors = []  # Warnings and errors, in the order found.
     reserved_found = False
     init_returns_impulse_found = False
     getwave_exists_found = False
     model_spec_found = False
-    params = list(param_dict.items())[0][1]
-    for label in list(params.keys()):
+    params = next(iter(param_dict.values()))
+    for label, group in params.items():
         if label == "Reserved_Parameters":
             reserved_found = True
-            tmp_params = params[label]
-            for param_name in list(tmp_params.keys()):
-                if param_name not in AMIParameter.RESERVED_PARAM_NAMES:
-                    err_str += f"WARNING: Unrecognized reserved parameter name, '{param_name}', found in parameter definition string!\n"
+            for param_name, param in group.items():
+                if param_name not in _RESERVED_PARAM_NAMES:
+                    errors.append(
+                        f"WARNING: Unrecognized reserved parameter name, '{param_name}', "
+                        "found in parameter definition string!\n"
+                    )
                     continue
-                param = tmp_params[param_name]
                 if param.pname == "AMI_Version":
                     if param.pusage != "Info" or param.ptype != "String":
-                        err_str += "WARNING: Malformed 'AMI_Version' parameter.\n"
+                        errors.append("WARNING: Malformed 'AMI_Version' parameter.\n")
                 elif param.pname == "Init_Returns_Impulse":
                     init_returns_impulse_found = True
                 elif param.pname == "GetWave_Exists":
@@ -434,21 +502,23 @@ def parse_ami_param_defs(param_str):  # pylint: disable=too-many-branches
         elif label == "description":
             pass
         else:
-            err_str += f"WARNING: Unrecognized group with label, '{label}', found in parameter definition string!\n"
+            errors.append(
+                f"WARNING: Unrecognized group with label, '{label}', found in parameter definition string!\n"
+            )
 
     if not reserved_found:
-        err_str += "ERROR: Reserved parameters section not found! It is required."
+        errors.append("ERROR: Reserved parameters section not found! It is required.")
 
     if not init_returns_impulse_found:
-        err_str += "ERROR: Reserved parameter, 'Init_Returns_Impulse', not found! It is required."
+        errors.append("ERROR: Reserved parameter, 'Init_Returns_Impulse', not found! It is required.")
 
     if not getwave_exists_found:
-        err_str += "ERROR: Reserved parameter, 'GetWave_Exists', not found! It is required."
+        errors.append("ERROR: Reserved parameter, 'GetWave_Exists', not found! It is required.")
 
     if not model_spec_found:
-        err_str += "WARNING: Model specific parameters section not found!"
+        errors.append("WARNING: Model specific parameters section not found!")
 
-    return (err_str, param_dict)
+    return ("".join(errors), param_dict)
 
 
 def make_gui_items(
@@ -473,9 +543,8 @@ def make_gui_items(
                     list_tips = param.plist_tip
                     default = param.pdefault
                     if list_tips:
-                        tmp_dict = {}
-                        tmp_dict.update(list(zip(list_tips, param.pvalue)))
-                        val = list(tmp_dict.keys())[0]
+                        tmp_dict = dict(zip(list_tips, param.pvalue))
+                        val = next(iter(tmp_dict))
                         if default:
                             for tip in tmp_dict.items():
                                 if tip == default:
@@ -492,36 +561,28 @@ def make_gui_items(
                     new_traits.append((pname, param.pvalue))
                     gui_items.append(Item(pname, tooltip=param.pdescription))
     else:  # subparameter branch
-        subparam_names = list(param.keys())
-        subparam_names.sort()
-        sub_items = []
+        top_lvl_params = []  # Put all top-level ungrouped parameters in a single VGroup.
+        sub_params = []
         group_desc = ""
 
         # Build GUI items for this branch.
-        for subparam_name in subparam_names:
+        for subparam_name in sorted(param):
             if subparam_name == "description":
                 group_desc = param[subparam_name]
             else:
                 tmp_items, tmp_traits = make_gui_items(subparam_name, param[subparam_name])
-                sub_items.extend(tmp_items)
+                for item in tmp_items:
+                    if isinstance(item, Item):
+                        top_lvl_params.append(item)
+                    else:
+                        sub_params.append(item)
                 new_traits.extend(tmp_traits)
-
-        # Put all top-level ungrouped parameters in a single VGroup.
-        top_lvl_params = []
-        sub_params = []
-        for item in sub_items:
-            if isinstance(item, Item):
-                top_lvl_params.append(item)
-            else:
-                sub_params.append(item)
-        sub_items = [Group(top_lvl_params)] + sub_params
+        sub_items = [Item(label=group_desc), Group(top_lvl_params), *sub_params]
 
         # Make the top-level group an HGroup; all others VGroups (default).
         if first_call:
-            gui_items.append(
-                Group([Item(label=group_desc)] + sub_items, label=pname, show_border=True, orientation="horizontal")
-            )
+            gui_items.append(Group(sub_items, label=pname, show_border=True, orientation="horizontal"))
         else:
-            gui_items.append(Group([Item(label=group_desc)] + sub_items, label=pname, show_border=True))
+            gui_items.append(Group(sub_items, label=pname, show_border=True))
 
     return gui_items, new_traits
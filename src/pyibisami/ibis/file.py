@@ -16,6 +16,8 @@ Copyright (c) 2019 by David Banas; All rights reserved World wide.
 
 import platform
 from datetime import datetime
+from functools import lru_cache
+from hashlib import sha256
 
 from traits.api import (
     Any,
@@ -32,8 +34,95 @@ from traits.api import (
 from traitsui.api import HGroup, Item, ModalButtons, VGroup, View, spring
 from traitsui.message import message
 
+from pyibisami.ibis.model import Component, Model
 from pyibisami.ibis.parser import parse_ibis_file
 
+# Parsed IBIS file contents, keyed by the digest of those contents, least recently used first,
+# so that re-instantiating ``IBISModel`` for an unchanged file, within the same process, skips the parser.
+# (Only the raw sub-keyword dictionaries are kept; each caller gets its own ``Component`` and ``Model`` objects,
+# since those hold GUI state. The raw dictionaries are shared, and must be treated as read-only.)
+_parsed = {}
+_PARSED_MAXSIZE = 32
+
+
+def _strip_objects(model_dict):
+    """Replace the ``Component`` and ``Model`` objects of a parsed IBIS file with their raw sub-keyword dictionaries.
+
+    Args:
+        model_dict (dict): A model dictionary, as returned by ``parse_ibis_file()``.
+
+    Returns:
+        dict: A shallow copy of ``model_dict``, suitable for caching.
+    """
+    res = dict(model_dict)
+    # pylint: disable=protected-access
+    if "components" in res:
+        res["components"] = {name: comp._subDict for name, comp in res["components"].items()}
+    if "models" in res:
+        res["models"] = {name: mod._subDict for name, mod in res["models"].items()}
+    return res
+
+
+def _build_objects(raw_dict):
+    """Inverse of ``_strip_objects()``, building new ``Component`` and ``Model`` objects.
+
+    Args:
+        raw_dict (dict): A model dictionary, as returned by ``_strip_objects()``.
+
+    Returns:
+        dict: A shallow copy of ``raw_dict``, with fresh ``Component`` and ``Model`` objects.
+    """
+    res = dict(raw_dict)
+    if "components" in res:
+        res["components"] = {name: Component(sub_dict) for name, sub_dict in res["components"].items()}
+    if "models" in res:
+        res["models"] = {name: Model(sub_dict) for name, sub_dict in res["models"].items()}
+    return res
+
+
+def _parse_cached(ibis_file_contents_str, debug=False):
+    """Parse the contents of an IBIS file, reusing the result of any recent parse of the same contents.
+
+    Args:
+        ibis_file_contents_str (str): The contents of the IBIS file, as a single string.
+
+    Keyword Args:
+        debug (bool): Output debugging info to console when true.
+            Default = False
+
+    Returns:
+        (str, dict): The ``(err_str, model_dict)`` pair returned by ``parse_ibis_file()``.
+
+    Notes:
+        1. The ``Component`` and ``Model`` objects in ``model_dict`` are new, on every call.
+        2. The cache is bypassed when ``debug`` is True, so that the parser's debugging output is always produced.
+    """
+    digest = sha256(ibis_file_contents_str.encode("utf-8")).digest()
+    parsed = _parsed.pop(digest, None)
+    if parsed is None or debug:
+        err_str, model_dict = parse_ibis_file(ibis_file_contents_str, debug=debug)
+        if parsed is None and len(_parsed) >= _PARSED_MAXSIZE:
+            del _parsed[next(iter(_parsed))]  # Evict the least recently used parse.
+        _parsed[digest] = (err_str, _strip_objects(model_dict))
+        return err_str, model_dict
+    _parsed[digest] = parsed  # Reinsert it as the most recently used parse.
+    err_str, raw_dict = parsed
+    return err_str, _build_objects(raw_dict)
+
+
+@lru_cache(maxsize=None)
+def _host_platform():
+    """Identify the host platform, just once per process.
+
+    Returns:
+        (str, str): The operating system name (e.g. - "Linux") and the interpreter's bitness (e.g. - "64bit").
+
+    Notes:
+        1. ``platform.architecture()`` runs the ``file`` command, in a subprocess,
+            which would otherwise dominate the cost of instantiating ``IBISModel`` for an already parsed file.
+    """
+    return (platform.system(), platform.architecture()[0])
+
 
 class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
     """HasTraits subclass for wrapping and interacting with an IBIS model.
@@ -73,29 +162,52 @@ class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
     model = Property(Any, depends_on=["mod"])
     pins = List  # Always holds the list of valid pin selections, given a component selection.
     models = List  # Always holds the list of valid model selections, given a pin selection.
+    pin = Enum(values="pins")
+    mod = Enum(values="models")
+    ibis_ver = Float
+    file_name = String
+    file_rev = String
+    date = String
 
     def get_models(self, mname):
         """Return the list of models associated with a particular name."""
-        model_dict = self._model_dict
-        if "model_selectors" in model_dict and mname in model_dict["model_selectors"]:
-            return list(map(lambda pr: pr[0], model_dict["model_selectors"][mname]))
-        return [mname]
+        return list(self._model_names(mname))
+
+    def _model_names(self, mname):
+        """Return the names of the models associated with a particular name, as a tuple,
+        looking them up only once per name."""
+        names = self._model_names_by_name.get(mname)
+        if names is None:
+            model_dict = self._model_dict
+            if "model_selectors" in model_dict and mname in model_dict["model_selectors"]:
+                names = tuple(pr[0] for pr in model_dict["model_selectors"][mname])
+            else:
+                names = (mname,)
+            self._model_names_by_name[mname] = names
+        return names
 
     def get_pins(self):
-        """Get the list of appropriate pins, given our type (i.e. - Tx or Rx)."""
-        pins = self.comp_.pins
+        """Get the list of appropriate pins, given our type (i.e. - Tx or Rx).
 
-        def pin_ok(pname):
-            (mname, _) = pins[pname]
-            mods = self.get_models(mname)
-            mod = self._models[mods[0]]
-            mod_type = mod.mtype.lower()
-            tx_ok = mod_type in ("output", "i/o")
-            if self._is_tx:
-                return tx_ok
-            return not tx_ok
-
-        return list(filter(pin_ok, list(pins)))
+        Notes:
+            1. The pins of each component are only sorted through once, since neither they,
+                nor our type, can change.
+        """
+        pin_names = self._pins_by_comp.get(self.comp)
+        if pin_names is None:
+            pins = self.comp_.pins
+
+            def pin_ok(pname):
+                (mname, _) = pins[pname]
+                mod = self._models[self._model_names(mname)[0]]
+                mod_type = mod.mtype.lower()
+                tx_ok = mod_type in ("output", "i/o")
+                if self._is_tx:
+                    return tx_ok
+                return not tx_ok
+
+            pin_names = self._pins_by_comp[self.comp] = tuple(filter(pin_ok, pins))
+        return list(pin_names)
 
     def __init__(self, ibis_file_name, is_tx, debug=False, gui=True):
         """
@@ -124,7 +236,7 @@ class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
         # Parse the IBIS file contents, storing any errors or warnings, and validate it.
         with open(ibis_file_name, "r", encoding="utf-8") as file:
             ibis_file_contents_str = file.read()
-        err_str, model_dict = parse_ibis_file(ibis_file_contents_str, debug=debug)
+        err_str, model_dict = _parse_cached(ibis_file_contents_str, debug=debug)
         self.log("IBIS parsing errors/warnings:\n" + err_str)
         if "components" not in model_dict or not model_dict["components"]:
             raise ValueError("This IBIS model has no components!")
@@ -135,27 +247,25 @@ class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
         self._model_dict = model_dict
         self._models = models
         self._is_tx = is_tx
+        self._info = None
+        self._view = None
+        self._pins_by_comp = {}
+        self._model_names_by_name = {}
 
         # Add Traits for various attributes found in the IBIS file.
-        self.add_trait("comp", Trait(list(components)[0], components))  # Doesn't need a custom mapper, because
+        self.add_trait("comp", Trait(next(iter(components)), components))  # Doesn't need a custom mapper, because
         self.pins = self.get_pins()  # the thing above it (file) can't change.
-        self.add_trait("pin", Enum(self.pins[0], values="pins"))
         (mname, _) = self.pin_
         self.models = self.get_models(mname)
-        self.add_trait("mod", Enum(self.models[0], values="models"))
-        self.add_trait("ibis_ver", Float(model_dict["ibis_ver"]))
-        self.add_trait("file_name", String(model_dict["file_name"]))
-        self.add_trait("file_rev", String(model_dict["file_rev"]))
-        if "date" in model_dict:
-            self.add_trait("date", String(model_dict["date"]))
-        else:
-            self.add_trait("date", String("(n/a)"))
+        self.ibis_ver = model_dict["ibis_ver"]
+        self.file_name = model_dict["file_name"]
+        self.file_rev = model_dict["file_rev"]
+        self.date = model_dict.get("date", "(n/a)")
 
         self._ibis_parsing_errors = err_str
-        self._os_type = platform.system()  # These 2 are used, to choose
-        self._os_bits = platform.architecture()[0]  # the correct AMI executable.
+        self._os_type, self._os_bits = _host_platform()  # Used to choose the correct AMI executable.
 
-        self._comp_changed(list(components)[0])  # Wasn't being called automatically.
+        self._comp_changed(next(iter(components)))  # Wasn't being called automatically.
         self._pin_changed(self.pins[0])  # Wasn't being called automatically.
 
         self.log("Done.")
@@ -164,29 +274,28 @@ class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
         return f"IBIS Model '{self._model_dict['file_name']}'"
 
     def info(self):
-        """Basic information about the IBIS model."""
-        res = ""
-        try:
-            for k in ["ibis_ver", "file_name", "file_rev"]:
-                res += k + ":\t" + str(self._model_dict[k]) + "\n"
-        except Exception as err:
-            print(f"{err}")
-            print(self._model_dict)
-            raise
-        res += "date" + ":\t\t" + str(self._model_dict["date"]) + "\n"
-        res += "\nComponents:"
-        res += "\n=========="
-        for c in list(self._model_dict["components"]):
-            res += "\n" + c + ":\n" + "---\n" + str(self._model_dict["components"][c]) + "\n"
-        res += "\nModel Selectors:"
-        res += "\n===============\n"
-        for s in list(self._model_dict["model_selectors"]):
-            res += f"{s}\n"
-        res += "\nModels:"
-        res += "\n======"
-        for m in list(self._model_dict["models"]):
-            res += "\n" + m + ":\n" + "---\n" + str(self._model_dict["models"][m])
-        return res
+        """Basic information about the IBIS model.
+
+        Notes:
+            1. The text is assembled only once, since the parsed model doesn't change.
+        """
+        if self._info is None:
+            model_dict = self._model_dict
+            res = [
+                f"ibis_ver:\t{self.ibis_ver}\nfile_name:\t{self.file_name}\nfile_rev:\t{self.file_rev}\n",
+                f"date:\t\t{self.date}\n",
+                "\nComponents:",
+                "\n==========",
+            ]
+            res.extend(f"\n{c}:\n---\n{comp}\n" for c, comp in model_dict["components"].items())
+            res.append("\nModel Selectors:")
+            res.append("\n===============\n")
+            res.extend(f"{s}\n" for s in model_dict["model_selectors"])
+            res.append("\nModels:")
+            res.append("\n======")
+            res.extend(f"\n{m}:\n---\n{mod}" for m, mod in model_dict["models"].items())
+            self._info = "".join(res)
+        return self._info
 
     def __call__(self):
         """Present a customized GUI to the user, for model selection, etc."""
@@ -206,30 +315,31 @@ class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
 
     def default_traits_view(self):
         "Default Traits/UI view definition."
-        view = View(
-            VGroup(
-                HGroup(
-                    Item("file_name", label="File name", style="readonly"),
-                    spring,
-                    Item("file_rev", label="rev", style="readonly"),
-                ),
-                HGroup(
-                    Item("ibis_ver", label="IBIS ver", style="readonly"),
-                    spring,
-                    Item("date", label="Date", style="readonly"),
+        if self._view is None:
+            self._view = View(
+                VGroup(
+                    HGroup(
+                        Item("file_name", label="File name", style="readonly"),
+                        spring,
+                        Item("file_rev", label="rev", style="readonly"),
+                    ),
+                    HGroup(
+                        Item("ibis_ver", label="IBIS ver", style="readonly"),
+                        spring,
+                        Item("date", label="Date", style="readonly"),
+                    ),
+                    HGroup(
+                        Item("comp", label="Component"),
+                        Item("pin", label="Pin"),
+                        Item("mod", label="Model"),
+                    ),
                 ),
-                HGroup(
-                    Item("comp", label="Component"),
-                    Item("pin", label="Pin"),
-                    Item("mod", label="Model"),
-                ),
-            ),
-            resizable=False,
-            buttons=ModalButtons,
-            title="PyBERT IBIS Model Selector",
-            id="pybert.pybert_ami.model_selector",
-        )
-        return view
+                resizable=False,
+                buttons=ModalButtons,
+                title="PyBERT IBIS Model Selector",
+                id="pybert.pybert_ami.model_selector",
+            )
+        return self._view
 
     @cached_property
     def _get_pin_(self):
@@ -257,7 +367,13 @@ class IBISModel(HasTraits):  # pylint: disable=too-many-instance-attributes
 
     @property
     def model_dict(self):
-        "Dictionary of all model keywords."
+        """Dictionary of all model keywords.
+
+        Notes:
+            1. The ``Component`` and ``Model`` objects are this instance's own,
+                but the raw keyword data beneath them may be shared with other
+                instances built from the same file contents, and must not be modified.
+        """
         return self._model_dict
 
     @property
@@ -13,12 +13,48 @@ Copyright (c) 2019 by David Banas; All rights reserved World wide.
 import numpy as np
 from chaco.api import ArrayPlotData, Plot
 from enable.component_editor import ComponentEditor
-from traits.api import HasTraits, String, Trait
+from traits.api import Any, HasTraits, Property, String, Trait, cached_property
 from traitsui.api import Group, Item, ModalButtons, View
 
 DBG = False
 
 
+def _proc_iv(vmeas, xs):
+    """Process an I/V table.
+
+    Args:
+        vmeas (float or None): The voltage at which to take the impedances.
+            (Half the maximum voltage is used, if ``None``.)
+        xs ([(float, [float])]): The table rows, as (voltage, typ/min/max currents).
+
+    Returns:
+        (vs, ityps, imins, imaxs, zs): *NumPy* arrays of the voltages,
+        the typical/minimum/maximum currents, and the typical/minimum/maximum impedances.
+
+    Raises:
+        ValueError: If the table is malformed, or has no voltage at/above ``vmeas``.
+    """
+    if len(xs) < 2:
+        raise ValueError("Insufficient number of I-V data points!")
+    try:
+        vs = np.array([v for v, _ in xs], dtype=float)
+        currents = np.array([iss for _, iss in xs], dtype=float)  # Rows of typ/min/max currents.
+    except Exception as exc:
+        raise ValueError(f"xs: {xs}") from exc
+    if currents.shape != (len(vs), 3):
+        raise ValueError(f"xs: {xs}")
+
+    # All three curves share the voltages, and so the index at which their impedances are taken.
+    # I-V tables list their voltages in ascending order, which allows a binary search.
+    ix = np.searchsorted(vs, vmeas if vmeas else vs[-1] / 2)
+    if ix == len(vs):
+        raise ValueError(f"No voltage at or above Vmeas ({vmeas}) in I-V table: {xs}")
+    dis = currents[ix] - currents[ix - 1]
+    with np.errstate(divide="ignore"):
+        zs = np.where(dis == 0, 1e7, np.abs((vs[ix] - vs[ix - 1]) / dis))  # Use 10 MOhms in place of infinity.
+    return vs, currents[:, 0], currents[:, 1], currents[:, 2], zs
+
+
 class Component(HasTraits):
     """Encapsulation of a particular component from an IBIS model file."""
 
@@ -34,15 +70,14 @@ class Component(HasTraits):
 
         # Stash the sub-keywords/parameters.
         self._subDict = subDict
+        self._str = None  # Built on first use; the component never changes.
+        self._view = None
 
         # Fetch available keyword/parameter definitions.
-        def maybe(name):
-            return subDict[name] if name in subDict else None
-
-        self._mfr = maybe("manufacturer")
-        self._pkg = maybe("package")
-        self._pins = maybe("pin")
-        self._diffs = maybe("diff_pin")
+        self._mfr = subDict.get("manufacturer")
+        self._pkg = subDict.get("package")
+        self._pins = subDict.get("pin")
+        self._diffs = subDict.get("diff_pin")
 
         # Check for the required keywords.
         if not self._mfr:
@@ -56,7 +91,7 @@ class Component(HasTraits):
         # Set up the GUI.
         self.add_trait("manufacturer", String(self._mfr))
         self.add_trait("package", String(self._pkg))
-        self.add_trait("_pin", Trait(list(self._pins)[0], self._pins))
+        self.add_trait("_pin", Trait(next(iter(self._pins)), self._pins))
         self._content = [
             Group(
                 Item("manufacturer", label="Manufacturer", style="readonly"),
@@ -68,26 +103,26 @@ class Component(HasTraits):
         ]
 
     def __str__(self):
-        res = "Manufacturer:\t" + self._mfr + "\n"
-        res += "Package:     \t" + str(self._pkg) + "\n"
-        res += "Pins:\n"
-        for pname in self._pins:
-            res += "    " + pname + ":\t" + str(self._pins[pname]) + "\n"
-        return res
+        if self._str is None:
+            res = [f"Manufacturer:\t{self._mfr}\nPackage:     \t{self._pkg}\nPins:\n"]
+            res.extend(f"    {pname}:\t{pin}\n" for pname, pin in self._pins.items())
+            self._str = "".join(res)
+        return self._str
 
     def __call__(self):
         self.edit_traits()
 
     def default_traits_view(self):
         "Default Traits/UI view definition."
-        view = View(
-            resizable=False,
-            buttons=ModalButtons,
-            title="PyBERT IBIS Component Viewer",
-            id="pyibisami.ibis_parser.Component",
-        )
-        view.set_content(self._content)
-        return view
+        if self._view is None:
+            self._view = View(
+                resizable=False,
+                buttons=ModalButtons,
+                title="PyBERT IBIS Component Viewer",
+                id="pyibisami.ibis_parser.Component",
+            )
+            self._view.set_content(self._content)
+        return self._view
 
     @property
     def pin(self):
@@ -107,6 +142,8 @@ class Component(HasTraits):
 class Model(HasTraits):  # pylint: disable=too-many-instance-attributes
     """Encapsulation of a particular I/O model from an IBIS model file."""
 
+    plot_iv = Property(Any)  # The I-V curves, built when first displayed.
+
     def __init__(self, subDict):  # pylint: disable=too-many-locals,too-many-statements
         """
         Args:
@@ -119,20 +156,20 @@ class Model(HasTraits):  # pylint: disable=too-many-instance-attributes
 
         # Stash the sub-keywords/parameters.
         self._subDict = subDict
+        self._str = None  # Built on first use; the model never changes.
+        self._view = None
+        self._iv_curves = None  # Plotted on first use of ``plot_iv``.
 
         # Fetch available keyword/parameter definitions.
-        def maybe(name):
-            return subDict[name] if name in subDict else None
-
-        self._mtype = maybe("model_type")
-        self._ccomp = maybe("c_comp")
-        self._cref = maybe("cref")
-        self._vref = maybe("vref")
-        self._vmeas = maybe("vmeas")
-        self._rref = maybe("rref")
-        self._trange = maybe("temperature_range")
-        self._vrange = maybe("voltage_range")
-        self._ramp = maybe("ramp")
+        self._mtype = subDict.get("model_type")
+        self._ccomp = subDict.get("c_comp")
+        self._cref = subDict.get("cref")
+        self._vref = subDict.get("vref")
+        self._vmeas = subDict.get("vmeas")
+        self._rref = subDict.get("rref")
+        self._trange = subDict.get("temperature_range")
+        self._vrange = subDict.get("voltage_range")
+        self._ramp = subDict.get("ramp")
 
         # Check for the required keywords.
         if not self._mtype:
@@ -140,70 +177,22 @@ class Model(HasTraits):  # pylint: disable=too-many-instance-attributes
         if not self._vrange:
             raise LookupError("Missing [Voltage Range]!")
 
-        def proc_iv(xs):
-            """Process an I/V table."""
-            if len(xs) < 2:
-                raise ValueError("Insufficient number of I-V data points!")
-            try:
-                vs, iss = zip(*(xs))  # Idiomatic Python for ``unzip``.
-            except Exception as exc:
-                raise ValueError(f"xs: {xs}") from exc
-            ityps, imins, imaxs = zip(*iss)
-            vmeas = self._vmeas
-
-            def calcZ(x):
-                (vs, ivals) = x
-                if vmeas:
-                    ix = np.where(np.array(vs) >= vmeas)[0][0]
-                else:
-                    ix = np.where(np.array(vs) >= max(vs) / 2)[0][0]
-                try:
-                    return abs((vs[ix] - vs[ix - 1]) / (ivals[ix] - ivals[ix - 1]))
-                except ZeroDivisionError:
-                    return 1e7  # Use 10 MOhms in place of infinity.
-
-            zs = map(calcZ, zip([vs, vs, vs], [ityps, imins, imaxs]))
-            return vs, ityps, imins, imaxs, zs
-
         # Infer impedance and/or rise/fall time, as per model type.
         mtype = self._mtype.lower()
         if mtype in ("output", "i/o"):
             if "pulldown" not in subDict or "pullup" not in subDict:
                 raise LookupError("Missing I-V curves!")
-            plotdata = ArrayPlotData()
-            pd_vs, pd_ityps, pd_imins, pd_imaxs, pd_zs = proc_iv(subDict["pulldown"])
-            pu_vs, pu_ityps, pu_imins, pu_imaxs, pu_zs = proc_iv(subDict["pullup"])
-            pu_vs = self._vrange[0] - np.array(pu_vs)  # Correct for Vdd-relative pull-up voltages.
-            pu_ityps = -np.array(pu_ityps)  # Correct for current sense, for nicer plot.
-            pu_imins = -np.array(pu_imins)
-            pu_imaxs = -np.array(pu_imaxs)
-            self._zout = (list(pd_zs)[0] + list(pu_zs)[0]) / 2
-            plotdata.set_data("pd_vs", pd_vs)
-            plotdata.set_data("pd_ityps", pd_ityps)
-            plotdata.set_data("pd_imins", pd_imins)
-            plotdata.set_data("pd_imaxs", pd_imaxs)
-            plotdata.set_data("pu_vs", pu_vs)
-            plotdata.set_data("pu_ityps", pu_ityps)
-            plotdata.set_data("pu_imins", pu_imins)
-            plotdata.set_data("pu_imaxs", pu_imaxs)
-            plot_iv = Plot(plotdata)  # , padding_left=75)
-            # The 'line_style' trait of a LinePlot instance must be 'dash' or 'dot dash' or 'dot' or 'long dash' or 'solid'.
-            plot_iv.plot(("pd_vs", "pd_ityps"), type="line", color="blue", line_style="solid", name="PD-Typ")
-            plot_iv.plot(("pd_vs", "pd_imins"), type="line", color="blue", line_style="dot", name="PD-Min")
-            plot_iv.plot(("pd_vs", "pd_imaxs"), type="line", color="blue", line_style="dash", name="PD-Max")
-            plot_iv.plot(("pu_vs", "pu_ityps"), type="line", color="red", line_style="solid", name="PU-Typ")
-            plot_iv.plot(("pu_vs", "pu_imins"), type="line", color="red", line_style="dot", name="PU-Min")
-            plot_iv.plot(("pu_vs", "pu_imaxs"), type="line", color="red", line_style="dash", name="PU-Max")
-            plot_iv.title = "Pull-Up/Down I-V Curves"
-            plot_iv.index_axis.title = "Vout (V)"
-            plot_iv.value_axis.title = "Iout (A)"
-            plot_iv.index_range.low_setting = 0
-            plot_iv.index_range.high_setting = self._vrange[0]
-            plot_iv.value_range.low_setting = 0
-            plot_iv.value_range.high_setting = 0.1
-            plot_iv.legend.visible = True
-            plot_iv.legend.align = "ul"
-            self.plot_iv = plot_iv
+            pd_vs, pd_ityps, pd_imins, pd_imaxs, pd_zs = _proc_iv(self._vmeas, subDict["pulldown"])
+            pu_vs, pu_ityps, pu_imins, pu_imaxs, pu_zs = _proc_iv(self._vmeas, subDict["pullup"])
+            pu_vs = self._vrange[0] - pu_vs  # Correct for Vdd-relative pull-up voltages.
+            for pu_is in (pu_ityps, pu_imins, pu_imaxs):  # Correct for current sense, for nicer plot.
+                np.negative(pu_is, out=pu_is)
+            self._zout = float(pd_zs[0] + pu_zs[0]) / 2
+            self._iv_curves = (
+                ("Pull-Up/Down I-V Curves", "Vout (V)", "Iout (A)"),
+                ("pd", pd_vs, pd_ityps, pd_imins, pd_imaxs),
+                ("pu", pu_vs, pu_ityps, pu_imins, pu_imaxs),
+            )
 
             if not self._ramp:
                 raise LookupError("Missing [Ramp]!")
@@ -212,78 +201,30 @@ class Model(HasTraits):  # pylint: disable=too-many-instance-attributes
         elif mtype == "input":
             if "gnd_clamp" not in subDict or "power_clamp" not in subDict:
                 raise LookupError("Missing clamp curves!")
-            plotdata = ArrayPlotData()
-            gc_vs, gc_ityps, gc_imins, gc_imaxs, gc_zs = proc_iv(subDict["gnd_clamp"])
-            pc_vs, pc_ityps, pc_imins, pc_imaxs, pc_zs = proc_iv(subDict["power_clamp"])
-            pc_vs = self._vrange[0] - np.array(pc_vs)  # Correct for Vdd-relative pull-up voltages.
-            pc_ityps = -np.array(pc_ityps)  # Correct for current sense, for nicer plot.
-            pc_imins = -np.array(pc_imins)
-            pc_imaxs = -np.array(pc_imaxs)
-            gc_z = list(gc_zs)[0]  # Use typical value for Zin calc.
-            pc_z = list(pc_zs)[0]
+            gc_vs, gc_ityps, gc_imins, gc_imaxs, gc_zs = _proc_iv(self._vmeas, subDict["gnd_clamp"])
+            pc_vs, pc_ityps, pc_imins, pc_imaxs, pc_zs = _proc_iv(self._vmeas, subDict["power_clamp"])
+            pc_vs = self._vrange[0] - pc_vs  # Correct for Vdd-relative pull-up voltages.
+            for pc_is in (pc_ityps, pc_imins, pc_imaxs):  # Correct for current sense, for nicer plot.
+                np.negative(pc_is, out=pc_is)
+            gc_z = float(gc_zs[0])  # Use typical value for Zin calc.
+            pc_z = float(pc_zs[0])
             self._zin = (gc_z * pc_z) / (gc_z + pc_z)  # Parallel combination, as both clamps are always active.
-            plotdata.set_data("gc_vs", gc_vs)
-            plotdata.set_data("gc_ityps", gc_ityps)
-            plotdata.set_data("gc_imins", gc_imins)
-            plotdata.set_data("gc_imaxs", gc_imaxs)
-            plotdata.set_data("pc_vs", pc_vs)
-            plotdata.set_data("pc_ityps", pc_ityps)
-            plotdata.set_data("pc_imins", pc_imins)
-            plotdata.set_data("pc_imaxs", pc_imaxs)
-            plot_iv = Plot(plotdata)  # , padding_left=75)
-            # The 'line_style' trait of a LinePlot instance must be 'dash' or 'dot dash' or 'dot' or 'long dash' or 'solid'.
-            plot_iv.plot(("gc_vs", "gc_ityps"), type="line", color="blue", line_style="solid", name="PD-Typ")
-            plot_iv.plot(("gc_vs", "gc_imins"), type="line", color="blue", line_style="dot", name="PD-Min")
-            plot_iv.plot(("gc_vs", "gc_imaxs"), type="line", color="blue", line_style="dash", name="PD-Max")
-            plot_iv.plot(("pc_vs", "pc_ityps"), type="line", color="red", line_style="solid", name="PU-Typ")
-            plot_iv.plot(("pc_vs", "pc_imins"), type="line", color="red", line_style="dot", name="PU-Min")
-            plot_iv.plot(("pc_vs", "pc_imaxs"), type="line", color="red", line_style="dash", name="PU-Max")
-            plot_iv.title = "Power/GND Clamp I-V Curves"
-            plot_iv.index_axis.title = "Vin (V)"
-            plot_iv.value_axis.title = "Iin (A)"
-            plot_iv.index_range.low_setting = 0
-            plot_iv.index_range.high_setting = self._vrange[0]
-            plot_iv.value_range.low_setting = 0
-            plot_iv.value_range.high_setting = 0.1
-            plot_iv.legend.visible = True
-            plot_iv.legend.align = "ul"
-            self.plot_iv = plot_iv
-
-        # Separate AMI executables by OS.
-        def is64(x):
-            ((_, b), _) = x
-            return int(b) == 64
-
-        def isWin(x):
-            ((os, _), _) = x
-            return os.lower() == "windows"
-
-        def partition(p, xs):
-            ts, fs = [], []
-            for x in xs:
-                if p(x):
-                    ts.append(x)
-                else:
-                    fs.append(x)
-            return ts, fs
-
-        def getFiles(x):
-            if x:
-                ((_, _), fs) = x[0]
-                return fs
-            return []
-
-        def splitExecs(fs):
-            wins, lins = partition(isWin, fs)
-            return (getFiles(wins), getFiles(lins))
-
-        self._exec32Wins, self._exec32Lins = [], []
-        self._exec64Wins, self._exec64Lins = [], []
-        if "algorithmic_model" in subDict:
-            execs = subDict["algorithmic_model"]
-            exec64s, exec32s = partition(is64, execs)
-            self._exec32Wins, self._exec32Lins = splitExecs(exec32s)
-            self._exec64Wins, self._exec64Lins = splitExecs(exec64s)
+            self._iv_curves = (
+                ("Power/GND Clamp I-V Curves", "Vin (V)", "Iin (A)"),
+                ("gc", gc_vs, gc_ityps, gc_imins, gc_imaxs),
+                ("pc", pc_vs, pc_ityps, pc_imins, pc_imaxs),
+            )
+
+        # Separate AMI executables by OS and bitness, in a single pass.
+        # Only the first file list given for each platform is kept.
+        execs = {}
+        for (os_name, bits), files in subDict.get("algorithmic_model", []):
+            key = ("windows" if os_name.lower() == "windows" else "linux", int(bits) == 64)
+            execs.setdefault(key, files)
+        self._exec32Wins = execs.get(("windows", False), [])
+        self._exec32Lins = execs.get(("linux", False), [])
+        self._exec64Wins = execs.get(("windows", True), [])
+        self._exec64Lins = execs.get(("linux", True), [])
 
         # Set up the GUI.
         self.add_trait("model_type", String(self._mtype))
@@ -325,40 +266,77 @@ class Model(HasTraits):  # pylint: disable=too-many-instance-attributes
             self._content.append(Item("plot_iv", editor=ComponentEditor(), show_label=False))
 
     def __str__(self):
-        res = "Model Type:\t" + self._mtype + "\n"
-        res += "C_comp:    \t" + str(self._ccomp) + "\n"
-        res += "Cref:      \t" + str(self._cref) + "\n"
-        res += "Vref:      \t" + str(self._vref) + "\n"
-        res += "Vmeas:     \t" + str(self._vmeas) + "\n"
-        res += "Rref:      \t" + str(self._rref) + "\n"
-        res += "Temperature Range:\t" + str(self._trange) + "\n"
-        res += "Voltage Range:    \t" + str(self._vrange) + "\n"
-        if "algorithmic_model" in self._subDict:
-            res += "Algorithmic Model:\n" + "\t32-bit:\n"
-            if self._exec32Lins:
-                res += "\t\tLinux: " + str(self._exec32Lins) + "\n"
-            if self._exec32Wins:
-                res += "\t\tWindows: " + str(self._exec32Wins) + "\n"
-            res += "\t64-bit:\n"
-            if self._exec64Lins:
-                res += "\t\tLinux: " + str(self._exec64Lins) + "\n"
-            if self._exec64Wins:
-                res += "\t\tWindows: " + str(self._exec64Wins) + "\n"
-        return res
+        if self._str is None:
+            res = [
+                f"Model Type:\t{self._mtype}\n",
+                f"C_comp:    \t{self._ccomp}\n",
+                f"Cref:      \t{self._cref}\n",
+                f"Vref:      \t{self._vref}\n",
+                f"Vmeas:     \t{self._vmeas}\n",
+                f"Rref:      \t{self._rref}\n",
+                f"Temperature Range:\t{self._trange}\n",
+                f"Voltage Range:    \t{self._vrange}\n",
+            ]
+            if "algorithmic_model" in self._subDict:
+                res.append("Algorithmic Model:\n\t32-bit:\n")
+                if self._exec32Lins:
+                    res.append(f"\t\tLinux: {self._exec32Lins}\n")
+                if self._exec32Wins:
+                    res.append(f"\t\tWindows: {self._exec32Wins}\n")
+                res.append("\t64-bit:\n")
+                if self._exec64Lins:
+                    res.append(f"\t\tLinux: {self._exec64Lins}\n")
+                if self._exec64Wins:
+                    res.append(f"\t\tWindows: {self._exec64Wins}\n")
+            self._str = "".join(res)
+        return self._str
 
     def __call__(self):
         self.edit_traits(kind="livemodal")
 
     def default_traits_view(self):
         "Default Traits/UI view definition."
-        view = View(
-            resizable=False,
-            buttons=ModalButtons,
-            title="PyBERT IBIS Model Viewer",
-            id="pyibisami.ibis_parser.Model",
-        )
-        view.set_content(self._content)
-        return view
+        if self._view is None:
+            self._view = View(
+                resizable=False,
+                buttons=ModalButtons,
+                title="PyBERT IBIS Model Viewer",
+                id="pyibisami.ibis_parser.Model",
+            )
+            self._view.set_content(self._content)
+        return self._view
+
+    @cached_property
+    def _get_plot_iv(self):
+        if self._iv_curves is None:
+            return None
+        (title, index_title, value_title), pulldown, pullup = self._iv_curves
+        plotdata = ArrayPlotData()
+        plot_iv = Plot(plotdata)  # , padding_left=75)
+        for (pfx, vs, ityps, imins, imaxs), color, lbl in ((pulldown, "blue", "PD"), (pullup, "red", "PU")):
+            plotdata.set_data(f"{pfx}_vs", vs)
+            plotdata.set_data(f"{pfx}_ityps", ityps)
+            plotdata.set_data(f"{pfx}_imins", imins)
+            plotdata.set_data(f"{pfx}_imaxs", imaxs)
+            # The 'line_style' trait of a LinePlot instance must be 'dash' or 'dot dash' or 'dot' or 'long dash' or 'solid'.
+            for curve, line_style in (("Typ", "solid"), ("Min", "dot"), ("Max", "dash")):
+                plot_iv.plot(
+                    (f"{pfx}_vs", f"{pfx}_i{curve.lower()}s"),
+                    type="line",
+                    color=color,
+                    line_style=line_style,
+                    name=f"{lbl}-{curve}",
+                )
+        plot_iv.title = title
+        plot_iv.index_axis.title = index_title
+        plot_iv.value_axis.title = value_title
+        plot_iv.index_range.low_setting = 0
+        plot_iv.index_range.high_setting = self._vrange[0]
+        plot_iv.value_range.low_setting = 0
+        plot_iv.value_range.high_setting = 0.1
+        plot_iv.legend.visible = True
+        plot_iv.legend.align = "ul"
+        return plot_iv
 
     @property
     def zout(self):
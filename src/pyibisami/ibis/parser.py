@@ -80,14 +80,11 @@ def word(p):
     Only skips space after words; dosen't skip comments or newlines.
     Requires, at least, one white space character after word.
     """
-    return p << regex(r"\s+")
+    return p << whitespace
 
 
-@generate("remainder of line")
-def rest_line():
-    "Parse remainder of line."
-    chars = yield many(none_of("\n\r")) << ignore  # So that we still function as a lexeme.
-    return "".join(chars)
+# Scan to the end of the line in a single regex match, rather than one character at a time.
+rest_line = (regex(r"[^\n\r]*") << ignore).desc("remainder of line")  # So that we still function as a lexeme.
 
 
 skip_line = lexeme(rest_line).result("(Skipped.)")
@@ -114,11 +111,15 @@ IBIS_num_suf = {
 }
 
 
+number_str = regex(r"[-+]?[0-9]*\.?[0-9]+(([eE][-+]?[0-9]+)|([TknGmpMuf][a-zA-Z]*))?") << many(letter()) << ignore
+num_suffix = re.compile(r"[^\d]+$")
+
+
 @generate("number")
 def number():
     "Parse an IBIS numerical value."
-    s = yield (regex(r"[-+]?[0-9]*\.?[0-9]+(([eE][-+]?[0-9]+)|([TknGmpMuf][a-zA-Z]*))?") << many(letter()) << ignore)
-    m = re.search(r"[^\d]+$", s)
+    s = yield number_str
+    m = num_suffix.search(s)
     if m:
         ix = m.start()
         c = s[ix]
@@ -205,6 +206,10 @@ def many1True(p):
 
 # IBIS file parser:
 
+keyword_open = regex(r"^\[", re.MULTILINE)
+keyword_wordlets = sepBy1(name_only, one_of(" _"))  # ``name`` gobbles up trailing space, which we don't want.
+keyword_close = string("]")
+
 
 def keyword(kywrd=""):
     """Parse an IBIS keyword.
@@ -221,9 +226,9 @@ def keyword(kywrd=""):
     @generate("IBIS keyword")
     def fn():
         "Parse IBIS keyword."
-        yield regex(r"^\[", re.MULTILINE)
-        wordlets = yield sepBy1(name_only, one_of(" _"))  # ``name`` gobbles up trailing space, which we don't want.
-        yield string("]")
+        yield keyword_open
+        wordlets = yield keyword_wordlets
+        yield keyword_close
         yield ignore  # So that ``keyword`` functions as a lexeme.
         res = "_".join(wordlets)  # Canonicalize to: "<wordlet1>_<wordlet2>_...".
         if kywrd:
@@ -235,14 +240,17 @@ def keyword(kywrd=""):
     return fn
 
 
+param_name = word(regex(r"^[a-zA-Z]\w*", re.MULTILINE))  # Parameters must begin with a letter in column 1.
+param_value = (word(string("=")) >> (number | rest_line)) | typminmax | name | rest_line
+
+
 @generate("IBIS parameter")
 def param():
     "Parse IBIS parameter."
-    # Parameters must begin with a letter in column 1.
-    pname = yield word(regex(r"^[a-zA-Z]\w*", re.MULTILINE))
+    pname = yield param_name
     if DBG:
         print(f"Parsing parameter {pname}...", end="")
-    res = yield ((word(string("=")) >> (number | rest_line)) | typminmax | name | rest_line)
+    res = yield param_value
     if DBG:
         print(res)
     yield ignore  # So that ``param`` functions as a lexeme.
@@ -268,11 +276,12 @@ def node(valid_keywords, stop_keywords, debug=False):
         1: Any keywords encountered that are _not_ found (via ``in``) in
             either ``valid_keywords`` or ``stop_keywords`` are ignored.
     """
+    any_keyword = keyword()
 
     @generate("kywrd")
     def kywrd():
         "Parse keyword syntax."
-        nm = yield keyword()
+        nm = yield any_keyword
         nmL = nm.lower()
         if debug:
             print(f"Parsing keyword: [{nm}]...")
@@ -405,12 +414,12 @@ def comp():
         print(f"Parsing component: {nm}")
     res = yield many1(node(Component_keywords, IBIS_keywords, debug=DBG))
     try:
-        Component(dict(res))
+        theComp = Component(dict(res))
     except LookupError as le:
         return fail_with(f"[Component] {nm}: {str(le)}")
     except Exception as err:  # pylint: disable=broad-exception-caught
         return fail_with(f"[Component] {nm}: {str(err)}")
-    return {nm: Component(dict(res))}
+    return {nm: theComp}
 
 
 @generate("[Model Selector]")
@@ -163,6 +163,8 @@ def run_tests(**kwargs):  # pylint: disable=too-many-locals
         print(f"Running test: {test_} ...")
         theModel = AMIModel(str(model))
         plot_names = plot_name(test_)
+        with open(Path(test_dir, test), encoding="utf-8") as test_file:  # Read once; used for every configuration.
+            template = test_file.read()
         for cfg_item in params:
             cfg_name = cfg_item[0]
             print(f"\tRunning test configuration: {cfg_name} ...")
@@ -182,15 +184,14 @@ def run_tests(**kwargs):  # pylint: disable=too-many-locals
                         "ref_dir": ref_dir,
                     },
                 )
+                cwd = Path().cwd()
                 try:
-                    cwd = Path().cwd()
                     chdir(out_dir)  # So that the images are saved in the output directory.
-                    with open(Path(test_dir, test), encoding="utf-8") as test_file:
-                        interpreter.file(test_file)
-                    chdir(cwd)
+                    interpreter.string(template)
                 except Exception as err:  # pylint: disable=broad-exception-caught
                     print("\t\t", err)
                 finally:
+                    chdir(cwd)
                     interpreter.shutdown()
         print("Test:", test_, "complete.")
     with open(xml_filename, "a", encoding="utf-8") as xml_file:
@@ -1,6 +1,11 @@
+import os
+import shutil
 from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
+import pytest
+
 import pyibisami.ami.config as config
 
 
@@ -168,3 +173,179 @@ AMIModel *ami_model = &my_tx;  ///< The pointer required by the API implementati
         Path(__file__).parents[1].joinpath("examples", "example_tx.ami").unlink()
         Path(__file__).parents[1].joinpath("examples", "example_tx.ibs").unlink()
         Path(__file__).parents[1].joinpath("examples", "example_tx.cpp").unlink()
+        for ext in ("ami", "ibs", "cpp"):
+            Path(__file__).parents[1].joinpath("examples", f"example_tx.{ext}.digest").unlink()
+
+    def test_ami_config_skips_unchanged(self, tmp_path):
+        """Verify that outputs are only rebuilt when their inputs change, or when forced."""
+
+        examples = Path(__file__).parents[1].joinpath("examples")
+        for fname in ("example_tx.py", "example_tx.cpp.em"):
+            shutil.copy(examples.joinpath(fname), tmp_path)
+        py_file = tmp_path.joinpath("example_tx.py")
+        ami_file = tmp_path.joinpath("example_tx.ami")
+
+        config.ami_config(py_file)
+        assert tmp_path.joinpath("example_tx.ami.digest").exists()
+        ami = ami_file.read_text()
+
+        ami_file.write_text("stale")
+        config.ami_config(py_file)
+        assert ami_file.read_text() == "stale"
+
+        config.ami_config(py_file, force=True)
+        assert ami_file.read_text() == ami
+
+    def test_write_atomically(self, tmp_path):
+        """Verify that generated files keep their line endings, and get the usual, umask governed, permissions."""
+
+        out_file = tmp_path.joinpath("out.ami")
+        old_umask = os.umask(0o002)
+        try:
+            config._write_atomically(out_file, "(root\n)\n")
+        finally:
+            os.umask(old_umask)
+        assert out_file.read_bytes() == f"(root{os.linesep})".encode() + os.linesep.encode()
+        if os.name == "posix":
+            assert out_file.stat().st_mode & 0o777 == 0o664
+        assert not tmp_path.joinpath("out.ami.tmp").exists()
+
+    def test_canonical(self):
+        """Verify that the digest input captures every element of long arrays, and the container types."""
+
+        wave = np.zeros(2000)
+        edited = wave.copy()
+        edited[1000] = 1.0
+        assert repr(config._canonical({"wave": wave})) != repr(config._canonical({"wave": edited}))
+        assert repr(config._canonical([1, 2])) != repr(config._canonical((1, 2)))
+        assert config._canonical({"a": [1, "b"]}) == ("dict", [("a", ("list", [1, "b"]))])
+
+    def test_load_template(self, tmp_path):
+        """Verify that templates are cached, but re-read after being edited."""
+
+        em_file = tmp_path.joinpath("test.em")
+        em_file.write_text("@(model_name)\n", encoding="utf-8")
+        template = config._load_template(em_file)
+        assert template == "@(model_name)\n"
+        assert config._load_template(em_file) is template
+
+        em_file.write_text("@(description)\n", encoding="utf-8")
+        mtime_ns = em_file.stat().st_mtime_ns + 1_000_000_000
+        os.utime(em_file, ns=(mtime_ns, mtime_ns))
+        assert config._load_template(em_file) == "@(description)\n"
+
+    def test_load_config(self, tmp_path):
+        """Verify that model configurations are cached, but reloaded after being edited."""
+
+        py_file = tmp_path.joinpath("test_cfg.py")
+        py_file.write_text("kDescription = 'One'\n", encoding="utf-8")
+        st = py_file.stat()
+        cfg = config._load_config(py_file, st.st_mtime_ns, st.st_size)
+        assert cfg.kDescription == "One"
+        assert config._load_config(py_file, st.st_mtime_ns, st.st_size) is cfg
+
+        py_file.write_text("kDescription = 'Second'\n", encoding="utf-8")
+        st = py_file.stat()
+        assert config._load_config(py_file, st.st_mtime_ns, st.st_size).kDescription == "Second"
+
+    nested_params = {
+        "tx_tap_units": {
+            "type": "INT",
+            "usage": "In",
+            "format": "Range",
+            "min": 6,
+            "max": 27,
+            "default": 27,
+            "description": '"Total current."',
+        },
+        "mode": {
+            "type": "STRING",
+            "usage": "In",
+            "format": "List",
+            "values": ['"a"', '"b"'],
+            "labels": ['"A"', '"B"'],
+            "default": '"a"',
+            "description": '"Mode."',
+        },
+        "ffe": {
+            "description": '"FFE."',
+            "subs": {
+                "enable": {
+                    "type": "BOOL",
+                    "usage": "InOut",
+                    "format": "Value",
+                    "default": "True",
+                    "description": '"On."',
+                },
+                "gain": {"type": "FLOAT", "usage": "Info", "format": "Value", "default": 1.5, "description": '"Gain."'},
+            },
+        },
+    }
+
+    def test_print_param(self, capsys):
+        """Verify the AMI file text produced for nested parameters."""
+
+        for pname, param in self.nested_params.items():
+            config.print_param("        ", pname, param)
+        assert capsys.readouterr().out == r"""         (tx_tap_units
+             (Usage In )
+             (Type Integer )
+             (Range 27 6 27 )
+             (Description "Total current." )
+         )
+         (mode
+             (Usage In )
+             (Type String )
+             (List "a" "b" )
+             (List_Tip "A" "B" )
+             (Description "Mode." )
+         )
+         (ffe
+             (enable
+                 (Usage InOut )
+                 (Type Boolean )
+                 (Value True )
+                 (Description "On." )
+             )
+             (gain
+                 (Usage Info )
+                 (Type Float )
+                 (Value 1.5 )
+                 (Description "Gain." )
+             )
+             (Description "FFE.")
+         )
+"""
+
+    def test_print_code(self, capsys):
+        """Verify the C++ code produced for nested parameters."""
+
+        for pname, param in self.nested_params.items():
+            config.print_code(pname, param)
+        assert capsys.readouterr().out == r"""        node_names.push_back("tx_tap_units");
+        int tx_tap_units;
+        tx_tap_units = get_param_int(node_names, 27);
+        node_names.pop_back();
+        node_names.push_back("mode");
+        char * mode;
+        mode = get_param_str(node_names, "a");
+        node_names.pop_back();
+        node_names.push_back("ffe");
+        node_names.push_back("enable");
+        bool enable;
+        enable = get_param_bool(node_names, true);
+        node_names.pop_back();
+        node_names.push_back("gain");
+        node_names.pop_back();
+        node_names.pop_back();
+"""
+
+    def test_param_types(self):
+        """Verify parameter type info. may be looked up by attribute, or by name, and is read-only."""
+
+        int_info = config.param_types["INT"]
+        assert int_info.c_type == int_info["c_type"] == "int"
+        assert int_info.getter == int_info["getter"] == "get_param_int"
+        assert int_info[1] == "Integer"
+        with pytest.raises(TypeError):
+            config.param_types["INT"] = config.ParamType("long", "Integer", "get_param_int")
@@ -1,9 +1,28 @@
+import os
 import sys
+from ctypes import c_double
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from pyibisami.ami.model import AMIModel, AMIModelInitializer, loadWave
+from pyibisami.ami import model
+from pyibisami.ami.model import (
+    AMIModel,
+    AMIModelInitializer,
+    _interp_unordered,
+    _resample_wave,
+    _sexpr,
+    interpFile,
+    loadWave,
+    process_lanes,
+)
+
+
+def fake_model(monkeypatch, ami_init, ami_get_wave=None, ami_close=lambda handle: 0):
+    """Create an ``AMIModel`` bound to the given stand-ins for the AMI functions."""
+    monkeypatch.setattr(model, "_bind_ami_funcs", lambda filename: (ami_init, ami_get_wave, ami_close))
+    return AMIModel("fake_model.so")
 
 
 def test_loadWave(tmp_path):
@@ -20,6 +39,92 @@ def test_loadWave(tmp_path):
     wave = loadWave(waveform)
     assert len(wave[0]) == len(wave[1])
     assert len(wave[0]) == 5
+    assert wave[0][-1] == pytest.approx(0.04)
+    assert wave[1][-1] == pytest.approx(0.004)
+
+    # Editing the file must be noticed, in spite of caching.
+    with open(waveform, "a") as test_file:
+        test_file.write("0.05 .005\n")
+    mtime_ns = waveform.stat().st_mtime_ns + 1_000_000_000
+    os.utime(waveform, ns=(mtime_ns, mtime_ns))
+    assert len(loadWave(waveform)[0]) == 6
+
+
+def test_interpFile(tmp_path):
+    """Verify resampling of a waveform file, with a time offset and a non-uniform time step."""
+    waveform = tmp_path.joinpath("waveform.txt")
+    with open(waveform, "w") as test_file:
+        test_file.write("Time Voltage\n")
+        test_file.write("1.0 0.0\n")
+        test_file.write("1.1 1.0\n")
+        test_file.write("1.3 3.0\n")
+        test_file.write("1.4 2.0\n")
+
+    wave = interpFile(waveform, 0.05)
+    assert wave == pytest.approx([0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 2.5], abs=1e-9)
+
+
+def test_interpFile_repeated_time(tmp_path):
+    """Verify resampling of a waveform file containing a repeated time value."""
+    waveform = tmp_path.joinpath("waveform.txt")
+    with open(waveform, "w") as test_file:
+        test_file.write("Time Voltage\n")
+        test_file.write("0.0 0.0\n")
+        test_file.write("0.1 1.0\n")
+        test_file.write("0.1 2.0\n")
+        test_file.write("0.3 4.0\n")
+
+    wave = interpFile(waveform, 0.05)
+    assert wave == pytest.approx([0.0, 0.5, 2.0, 2.5, 3.0, 3.5], abs=1e-9)
+
+
+def test_interp_unordered():
+    """Verify that the fallback interpolation agrees with ``np.interp()``, for strictly increasing times."""
+    rng = np.random.default_rng(0)
+    ts = np.cumsum(rng.uniform(0.1, 1.0, 50))
+    ts -= ts[0]
+    vs = rng.normal(size=50)
+    t_new = np.arange(0.0, ts[-1], 0.3)
+    assert _interp_unordered(t_new, ts, vs) == pytest.approx(np.interp(t_new, ts, vs), abs=1e-12)
+
+
+def test_interpFile_cached(tmp_path):
+    """Verify that resampling a file again reuses the previous result, unless the file changes."""
+    waveform = tmp_path.joinpath("waveform.txt")
+    with open(waveform, "w") as test_file:
+        test_file.write("Time Voltage\n0.0 0.0\n0.4 4.0\n")
+
+    wave = interpFile(waveform, 0.1)
+    hits = _resample_wave.cache_info().hits
+    assert interpFile(str(waveform), 0.1).tolist() == wave.tolist()
+    assert _resample_wave.cache_info().hits == hits + 1
+    with open(waveform, "w") as test_file:
+        test_file.write("Time Voltage\n0.0 0.0\n0.4 8.0\n")
+    mtime_ns = waveform.stat().st_mtime_ns + 1_000_000_000
+    os.utime(waveform, ns=(mtime_ns, mtime_ns))
+    assert interpFile(waveform, 0.1) == pytest.approx([0.0, 2.0, 4.0, 6.0])
+
+
+def test_sexpr():
+    """Verify the S-expression built for a branch of AMI parameters."""
+    assert _sexpr("tx_tap_np1", 0) == "(tx_tap_np1 0)"
+    assert _sexpr("ctle", {"mode": "Manual", "gain": {"dc": 1.5, "ac": 3}}) == (
+        "(ctle (mode Manual) (gain (dc 1.5) (ac 3)))"
+    )
+
+
+def test_interpFile_same_rate(tmp_path):
+    """Verify that a waveform already at the requested sample rate is passed through."""
+    waveform = tmp_path.joinpath("waveform.txt")
+    with open(waveform, "w") as test_file:
+        test_file.write("Time Voltage\n")
+        for n, v in enumerate([0.0, 1.0, 3.0, 2.0]):
+            test_file.write(f"{1.0 + 0.125 * n} {v}\n")
+
+    wave = interpFile(waveform, 0.125)
+    assert wave.tolist() == [0.0, 1.0, 3.0]
+    wave[0] = 5.0  # Mustn't affect subsequent reads.
+    assert interpFile(waveform, 0.125)[0] == 0.0
 
 
 class Test_AMIModel(object):
@@ -48,6 +153,142 @@ class Test_AMIModel(object):
             "(tap_weights_[3] -0)\n"
         ).encode("utf-8")
 
+    def test_process_lanes(self):
+        """Verify that each lane's wave is run through its own model, and the results returned in order."""
+
+        class FakeModel:
+            def __init__(self, gain):
+                self.gain = gain
+
+            def getWave(self, wave, bits_per_call=0):
+                return wave * self.gain, np.array([bits_per_call]), [f"gain = {self.gain}"]
+
+        models = [FakeModel(gain) for gain in range(4)]
+        waves = [np.arange(n + 1.0) for n in range(4)]
+        results = process_lanes(models, waves, bits_per_call=8)
+        for gain, (wave, result) in enumerate(zip(waves, results)):
+            assert (result[0] == wave * gain).all()
+            assert result[1] == [8]
+            assert result[2] == [f"gain = {gain}"]
+        assert process_lanes([], []) == []
+        with pytest.raises(ValueError):
+            process_lanes(models[:1] * 2, waves[:2])
+        with pytest.raises(ValueError):
+            process_lanes(models, waves[:2])
+
+    def test_responses_read_only(self, monkeypatch):
+        """Verify that the response properties share, but can't modify, the model's arrays,
+        and are refreshed by each initialization."""
+        dut = fake_model(monkeypatch, lambda *args: 0)
+        initializer = AMIModelInitializer({"root_name": "exampleTx"}, info_params={"GetWave_Exists": False})
+        dut.initialize(initializer)
+        assert dut.initOut is dut.initOut
+        for resp, arr in ((dut.initOut, dut._initOut), (dut.channel_response, dut._channel_response)):
+            assert np.shares_memory(resp, arr)
+            with pytest.raises(ValueError):
+                resp[0] = 1.0
+        assert dut._initOut.flags.writeable
+        init_out = dut.initOut
+        initializer.channel_response = np.pad([0.0, 2.0], (0, 126))
+        dut.initialize(initializer)
+        assert dut.initOut[1] == 2.0
+        assert init_out[1] == 1.0
+
+    def test_model_output_buffer(self, monkeypatch):
+        """Verify that the model writes its response into its own copy of the channel response."""
+
+        def fake_init(impulse_matrix, row_size, *args):
+            for n in range(row_size):
+                impulse_matrix[n] *= 2.0
+            return 0
+
+        dut = fake_model(monkeypatch, fake_init)
+        initializer = AMIModelInitializer({"root_name": "exampleTx"}, info_params={"GetWave_Exists": False})
+        initializer.channel_response = [0.0, 1.0, 0.5, 0.0]
+        dut.initialize(initializer)
+        assert dut.initOut.tolist() == [0.0, 2.0, 1.0, 0.0]
+        assert dut.channel_response.tolist() == [0.0, 1.0, 0.5, 0.0]
+        assert initializer.channel_response.tolist() == [0.0, 1.0, 0.5, 0.0]
+
+    def test_model_handles(self, monkeypatch):
+        """Verify that the model's memory is freed exactly once per initialization,
+        and that the handles it writes to are reused."""
+        closed = []
+
+        def fake_init(*args):
+            args[7]._obj.value = 0x1234  # AMI_memory_handle
+            args[8]._obj.value = b"Initializing..."  # msg
+            return 0
+
+        dut = fake_model(monkeypatch, fake_init, ami_close=lambda handle: closed.append(handle.value))
+        handles = (dut._ami_params_out, dut._ami_mem_handle, dut._msg)
+        initializer = AMIModelInitializer({"root_name": "exampleTx"}, info_params={"GetWave_Exists": False})
+        dut.initialize(initializer)
+        assert dut.msg == b"Initializing..."
+        assert not closed
+        dut.initialize(initializer)
+        assert closed == [0x1234]
+        assert (dut._ami_params_out, dut._ami_mem_handle, dut._msg) == handles
+        del dut
+        assert closed == [0x1234, 0x1234]
+
+    def test_getWaveInPlace(self, monkeypatch):
+        """Verify that ``getWaveInPlace()`` has the model process the given array, chunk by chunk."""
+        chunks = []
+
+        def fake_get_wave(wave, wave_size, *args):
+            chunks.append(wave_size)
+            for n in range(wave_size):
+                wave[n] *= 2.0
+            return 0
+
+        dut = fake_model(monkeypatch, lambda *args: 0, ami_get_wave=fake_get_wave)
+        dut.initialize(AMIModelInitializer({"root_name": "exampleTx"}, info_params={"GetWave_Exists": True}))
+        wave = np.arange(300.0)
+        wave_out, clock_times, params_out = dut.getWave(wave)
+        assert wave_out.tolist() == (2.0 * np.arange(300.0)).tolist()
+        assert wave.tolist() == np.arange(300.0).tolist()
+        assert chunks == [128, 128, 44]
+        assert len(clock_times) == 75
+        assert len(params_out) == 3
+        assert dut.getWaveInPlace(wave)[0] is wave
+        assert wave.tolist() == wave_out.tolist()
+        with pytest.raises(ValueError):
+            dut.getWaveInPlace(np.arange(8))
+        with pytest.raises(ValueError):
+            dut.getWaveInPlace(np.arange(16.0)[::2])
+
+    def test_aggressor_rows(self, monkeypatch):
+        """Verify that a flat victim + aggressor response keeps its row size,
+        and that ``AMI_Init()`` is never handed a response of the wrong size."""
+        calls = []
+
+        def fake_init(impulse_matrix, row_size, num_aggressors, *args):
+            calls.append((row_size, num_aggressors))
+            return 0
+
+        dut = fake_model(monkeypatch, fake_init)
+        initializer = AMIModelInitializer(
+            {"root_name": "exampleTx"},
+            info_params={"GetWave_Exists": False},
+            channel_response=(c_double * 8)(*range(8)),
+            row_size=4,
+            num_aggressors=1,
+        )
+        assert (initializer.row_size, initializer.num_aggressors) == (4, 1)
+        dut.initialize(initializer)
+        assert calls == [(4, 1)]
+        initializer.row_size = 8
+        with pytest.raises(ValueError):
+            dut.initialize(initializer)
+        assert calls == [(4, 1)]
+
+    def test_getWave_missing(self, monkeypatch):
+        """Verify that calling ``getWave()`` on a model without ``AMI_GetWave()`` fails cleanly."""
+        dut = fake_model(monkeypatch, lambda *args: 0)
+        with pytest.raises(RuntimeError):
+            dut.getWave(np.zeros(8))
+
 
 class Test_AMIModelInitializer(object):
     def test_init(self):
@@ -55,3 +296,41 @@ class Test_AMIModelInitializer(object):
         assert dut.ami_params == {"root_name": ""}
         data = ["channel_response", "row_size", "num_aggressors", "sample_interval", "bit_time"]
         assert all(name in dut._init_data for name in data)
+
+    def test_channel_response(self):
+        """Verify that a channel response matrix sets the row size and number of aggressors."""
+        dut = AMIModelInitializer({"root_name": "exampleTx"})
+        dut.channel_response = [[0.0, 1.0, 0.0], [0.0, 0.5, 0.0]]
+        assert dut.row_size == 3
+        assert dut.num_aggressors == 1
+        assert dut.channel_response.tolist() == [[0.0, 1.0, 0.0], [0.0, 0.5, 0.0]]
+
+    def test_instances_independent(self):
+        """Verify that overriding one instance's initialization data doesn't affect other instances."""
+        dut = AMIModelInitializer({"root_name": "exampleTx"}, row_size=64)
+        dut.bit_time = 50e-12
+        dut.sample_interval = 10e-12
+        other = AMIModelInitializer({"root_name": "exampleTx"})
+        assert (dut.row_size, dut.bit_time, dut.sample_interval) == (64, 50e-12, 10e-12)
+        assert (other.row_size, other.bit_time, other.sample_interval) == (128, 0.1e-9, 25e-12)
+
+    def test_optional_args(self, tmp_path):
+        """Verify that the initialization data overrides may be given in any order."""
+        waveform = tmp_path.joinpath("waveform.txt")
+        with open(waveform, "w") as test_file:
+            test_file.write("Time Voltage\n")
+            test_file.write("0.0 0.0\n")
+            test_file.write("0.4 4.0\n")
+        dut = AMIModelInitializer(
+            {"root_name": "exampleTx"}, channel_response=str(waveform), bit_time=0.2, row_size=64, sample_interval=0.1
+        )
+        assert dut.channel_response.tolist() == pytest.approx([0.0, 1.0, 2.0, 3.0])
+        assert (dut.row_size, dut.num_aggressors) == (4, 0)
+        assert (dut.sample_interval, dut.bit_time) == (0.1, 0.2)
+
+    def test_unknown_optional_args(self):
+        """Verify that unrecognized initialization data overrides are ignored."""
+        dut = AMIModelInitializer({"root_name": "exampleTx"}, row_size=64, ami_params_in="(exampleTx)", foo=1)
+        assert dut.row_size == 64
+        assert set(dut._init_data) == set(AMIModelInitializer._init_data)
+        assert not hasattr(dut, "foo")
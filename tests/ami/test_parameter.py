@@ -1,9 +1,21 @@
 import pytest
 
-from pyibisami.ami.parameter import AMIParamError
+from pyibisami.ami.parameter import AMIParamError, AMIParameter
 
 
 class Test_AMI_Parameter(object):
     def test_AMIParamError(self):
         with pytest.raises(Exception):
             raise AMIParamError("Test")
+
+    def test_list(self):
+        param = AMIParameter("p", [("Usage", ["In"]), ("Type", ["Float"]), ("List", ["1", "2.5", "-3e-1"])])
+        assert param.pvalue == [1.0, 2.5, -0.3]
+        assert all(isinstance(val, float) for val in param.pvalue)
+        with pytest.raises(AMIParamError):
+            AMIParameter("p", [("Usage", ["In"]), ("Type", ["Integer"]), ("List", ["1", "2.5"])])
+
+    def test_range(self):
+        param = AMIParameter("p", [("Usage", ["In"]), ("Type", ["Integer"]), ("Range", ["3", "0", "7"])])
+        assert (param.pvalue, param.pmin, param.pmax) == (3, 0, 7)
+        assert all(isinstance(val, int) for val in (param.pvalue, param.pmin, param.pmax))
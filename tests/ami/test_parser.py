@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 
 import pyibisami.ami.parser as ami_parse
@@ -86,3 +88,86 @@ class TestAMIParse:
         ami = ami_parse.AMIParamConfigurator(test_ami_config)
         assert ami.fetch_param_val(["Reserved_Parameters", "Init_Returns_Impulse"])
         assert not ami.fetch_param_val(["Reserved_Parameters", "Bad Name"])
+        branch_names = ["Reserved_Parameters", "Init_Returns_Impulse"]
+        assert ami.fetch_param_val(branch_names)
+        assert branch_names == ["Reserved_Parameters", "Init_Returns_Impulse"]
+        assert ami.fetch_param_val(("Model_Specific", "tx_tap_units")) == 27
+        assert ami.fetch_param_val(("Model_Specific", "tx_tap_units", "Too Deep")) is None
+
+    def test_parse_comments_and_nesting(self):
+        error_string, param_defs = ami_parse.parse_ami_param_defs(
+            """| Leading comment.
+(root | Comment after a label.
+    (Description "A (quoted) | string.") | Trailing comment.
+    (Reserved_Parameters
+        (Init_Returns_Impulse (Usage Info) (Type Boolean) (Value True))
+        (GetWave_Exists (Usage Info) (Type Boolean) (Value False)))
+    (Model_Specific(tx_tap (Usage In)(Type Float)(Value -.5e-3)))
+)"""
+        )
+        assert error_string == ""
+        assert param_defs["root"]["description"] == "A (quoted) | string."
+        assert param_defs["root"]["Model_Specific"]["tx_tap"].pvalue == -0.5e-3
+
+    def test_parse_error(self):
+        error_string, param_defs = ami_parse.parse_ami_param_defs("(root\n  (a b)\n  (c -d))")
+        assert error_string == "Expected ) at 2:2 in:\n(c -d))"
+        assert param_defs == {}
+
+    def test_parse_no_params(self):
+        error_string, param_defs = ami_parse.parse_ami_param_defs("(a b c)")
+        assert error_string.startswith("ERROR:")
+        assert param_defs == {}
+
+    def test_proc_branch_deep(self):
+        branch = ("p", [("Usage", ["In"]), ("Type", ["Integer"]), ("Value", ["3"])])
+        for n in range(2 * sys.getrecursionlimit()):
+            branch = (f"b{n}", [branch])
+        error_string, param_dict = ami_parse.proc_branch(branch)
+        assert error_string == ""
+        while isinstance(param_dict, dict):
+            (param_dict,) = param_dict.values()
+        assert param_dict.pvalue == 3
+
+    def test_proc_branch_reuse(self):
+        branch = ("p", [("Usage", ["In"]), ("Type", ["Integer"]), ("List", ["1", "2"])])
+        _, first = ami_parse.proc_branch(branch)
+        hits = ami_parse._build_ami_param.cache_info().hits
+        _, second = ami_parse.proc_branch(branch)
+        assert ami_parse._build_ami_param.cache_info().hits == hits + 1
+        assert first["p"] is not second["p"]
+        first["p"].pvalue.append(3)
+        assert second["p"].pvalue == [1, 2]
+
+    def test_set_param_val(self, test_ami_config):
+        ami = ami_parse.AMIParamConfigurator(test_ami_config)
+        ami.set_param_val(["Model_Specific", "tx_tap_np1"], 3)
+        assert ami.fetch_param_val(["Model_Specific", "tx_tap_np1"]) == 3
+        with pytest.raises(ValueError):
+            ami.set_param_val(["Model_Specific", "Bad Name"], 3)
+
+    def test_input_ami_params(self, test_ami_config):
+        ami = ami_parse.AMIParamConfigurator(test_ami_config)
+        params = ami.input_ami_params
+        assert params["root_name"] == "example_tx"
+        assert params["tx_tap_units"] == 27
+        params["tx_tap_units"] = 0
+        assert ami.input_ami_params["tx_tap_units"] == 27
+        ami.tx_tap_units = 12
+        assert ami.input_ami_params["tx_tap_units"] == 12
+
+    def test_parse_error_context(self):
+        error_string, _ = ami_parse.parse_ami_param_defs("(root (a -b)" + " (c d)" * 100 + ")")
+        assert error_string.startswith("Expected ) at 0:6 in:\n(a -b) (c d)")
+        assert len(error_string.split("\n")[1]) == 80
+
+    def test_mapped_param(self, test_ami_config):
+        ami = ami_parse.AMIParamConfigurator(
+            test_ami_config.replace(
+                "(Model_Specific", '(Model_Specific (mode (Usage In) (Type Integer) (List 1 2) (List_Tip "one" "two"))'
+            )
+        )
+        assert ami.input_ami_params["mode"] == 1
+        ami.set_param_val(["Model_Specific", "mode"], 2)
+        assert ami.mode == "two"
+        assert ami.input_ami_params["mode"] == 2
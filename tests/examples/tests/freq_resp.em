@@ -40,17 +40,17 @@ for cfg in data:
     print(model.ami_params_out)
     h = model.initOut
     T = model.sample_interval
-    t = array([i * T for i in range(len(h))])
+    t = arange(len(h)) * T
     s = cumsum(h) * T  # Step response.
     # The weird shifting by half the h-vector length is to better accomodate frequency-domain models.
     half_len = len(h) // 2
-    s2 = model.getWave(array([0.0] * half_len + [1.0] * half_len), len(h))[0]
+    s2 = model.getWave(repeat([0.0, 1.0], half_len), len(h))[0]
     s2_plot = pad(s2[half_len:], (0, half_len), 'edge')
     h2 = diff(s2)
     H = fft(h)
     H *= s[-1] / abs(H[0])  # Normalize for proper d.c.
     H2 = fft(h2)
-    f = array([i * 1.0 // (T * len(h)) for i in range(len(h) // 2)])
+    f = arange(len(h) // 2) * 1.0 // (T * len(h))
     rgb_main, rgb_ref = next(plot_colors)
     rgb_main = tuple(int(color * 0xFF) for color in rgb_main)
     rgb_ref = tuple(int(color * 0xFF) for color in rgb_ref)
@@ -0,0 +1,74 @@
+from pyibisami.ibis import file as ibis_file
+from pyibisami.ibis.file import IBISModel
+from pyibisami.ibis.parser import parse_ibis_file
+
+
+def test_IBISModel_parses_once(ibis_test_file, monkeypatch):
+    """Verify that the same IBIS file contents only get parsed once."""
+    calls = []
+
+    def counting_parse(contents, debug=False):
+        calls.append(contents)
+        return parse_ibis_file(contents, debug=debug)
+
+    monkeypatch.setattr(ibis_file, "_parsed", {})
+    monkeypatch.setattr(ibis_file, "parse_ibis_file", counting_parse)
+    first = IBISModel(ibis_test_file, True, gui=False)
+    second = IBISModel(ibis_test_file, True, gui=False)
+    assert len(calls) == 1
+    assert second.ibis_parsing_errors == first.ibis_parsing_errors
+    assert str(second.model) == str(first.model)
+    # Each instance gets its own (stateful) components and models.
+    assert second.model is not first.model
+    assert second.comp_ is not first.comp_
+    IBISModel(ibis_test_file, True, debug=True, gui=False)
+    assert len(calls) == 2  # Debugging output is never skipped.
+
+
+def test_parse_cached_evicts(monkeypatch):
+    """Verify that only the most recently parsed file contents are kept."""
+    calls = []
+
+    def counting_parse(contents, debug=False):
+        calls.append(contents)
+        return ("Success!", {})
+
+    monkeypatch.setattr(ibis_file, "_parsed", {})
+    monkeypatch.setattr(ibis_file, "_PARSED_MAXSIZE", 2)
+    monkeypatch.setattr(ibis_file, "parse_ibis_file", counting_parse)
+    for contents in ["a", "b", "a", "c", "a", "b"]:
+        ibis_file._parse_cached(contents)
+    assert calls == ["a", "b", "c", "b"]
+    assert len(ibis_file._parsed) == 2
+
+
+def test_IBISModel_info(ibis_test_file):
+    """Verify the model summary, and that it's only assembled once."""
+    model = IBISModel(ibis_test_file, True, gui=False)
+    info = model.info()
+    assert info.startswith("ibis_ver:\t5.1\nfile_name:\texample_tx.ibs\nfile_rev:\tv0.1\n")
+    assert "\nComponents:\n==========\nExample_Tx:\n---\n" in info
+    assert "\nModels:\n======\nexample_tx:\n---\nModel Type:\tOutput\n" in info
+    assert model.info() is info
+
+
+def test_IBISModel_traits(ibis_test_file):
+    """Verify the initial model selections and file attributes."""
+    model = IBISModel(ibis_test_file, True, gui=False)
+    assert (model.comp, model.pin, model.mod) == ("Example_Tx", model.pins[0], "example_tx")
+    assert (model.ibis_ver, model.file_name, model.file_rev) == (5.1, "example_tx.ibs", "v0.1")
+    model.pin = model.pins[-1]
+    assert model.mod == "example_tx"
+
+
+def test_IBISModel_pins_and_models(ibis_test_file):
+    """Verify the pin and model lookups, which are remembered, and that their results may be modified freely."""
+    model = IBISModel(ibis_test_file, True, gui=False)
+    pins = model.get_pins()
+    assert pins == model.pins
+    pins.clear()
+    assert model.get_pins() == model.pins
+    models = model.get_models("example_tx")
+    assert models == ["example_tx"]
+    models.append("bogus")
+    assert model.get_models("example_tx") == ["example_tx"]
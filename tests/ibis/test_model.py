@@ -0,0 +1,99 @@
+import pytest
+
+from pyibisami.ibis.model import Model, _proc_iv
+
+
+def output_model(**overrides):
+    """Build the sub-keyword dictionary of a simple 50 Ohm output model."""
+    iv = [(v, [v / 50.0, v / 40.0, v / 60.0]) for v in (-1.8, 0.0, 0.9, 1.8, 3.6)]
+    sub_dict = {
+        "model_type": "Output",
+        "voltage_range": [1.8, 1.62, 1.98],
+        "pulldown": iv,
+        "pullup": iv,
+        "ramp": {"rising": [0.6e9, 0.5e9, 0.7e9], "falling": [0.4e9, 0.3e9, 0.5e9]},
+    }
+    sub_dict.update(overrides)
+    return sub_dict
+
+
+def test_output_model():
+    """Verify the impedance and slew rate inferred for an output model."""
+    model = Model(output_model())
+    assert model.zout == pytest.approx(50.0)
+    assert model.slew == pytest.approx(0.5)
+    assert model.mtype == "Output"
+
+
+def test_output_model_vmeas():
+    """Verify that the impedance is taken at ``Vmeas``, when given."""
+    pulldown = [(v, [i, i, i]) for v, i in ((0.0, 0.0), (0.5, 0.01), (1.0, 0.03), (2.0, 0.05))]
+    assert Model(output_model(pulldown=pulldown)).zout == pytest.approx((25.0 + 50.0) / 2)
+    assert Model(output_model(pulldown=pulldown, vmeas=0.4)).zout == pytest.approx((50.0 + 50.0) / 2)
+
+
+def test_output_model_flat_iv():
+    """Verify that a flat I-V curve is given a very high impedance."""
+    pulldown = [(v, [0.0, 0.0, 0.0]) for v in (0.0, 1.0, 2.0)]
+    assert Model(output_model(pulldown=pulldown)).zout == pytest.approx((1e7 + 50.0) / 2)
+
+
+def test_output_model_bad_iv():
+    """Verify that malformed I-V curves are rejected."""
+    with pytest.raises(ValueError):
+        Model(output_model(pulldown=[(0.0, [0.0, 0.0, 0.0])]))
+    with pytest.raises(ValueError):
+        Model(output_model(pulldown=[(0.0, [0.0]), (1.0, [0.02])]))
+    with pytest.raises(ValueError):
+        Model(output_model(vmeas=5.0))
+
+
+def test_algorithmic_model_execs():
+    """Verify that AMI executables are sorted by OS and bitness, keeping the first of each."""
+    execs = [
+        (("Windows", "32"), ["w32.dll", "w32.ami"]),
+        (("Linux", "64"), ["l64.so", "l64.ami"]),
+        (("windows", "64"), ["w64.dll", "w64.ami"]),
+        (("Linux", "64"), ["other.so", "other.ami"]),
+    ]
+    model = Model(output_model(algorithmic_model=execs))
+    assert model._exec32Wins == ["w32.dll", "w32.ami"]
+    assert model._exec32Lins == []
+    assert model._exec64Wins == ["w64.dll", "w64.ami"]
+    assert model._exec64Lins == ["l64.so", "l64.ami"]
+
+
+def test_model_str_cached():
+    """Verify that the text rendering of a model is built only once."""
+    model = Model(output_model())
+    text = str(model)
+    assert text.startswith("Model Type:\tOutput\n")
+    assert str(model) is text
+
+
+def test_model_view_cached():
+    """Verify that the Traits/UI view of a model is built only once."""
+    model = Model(output_model())
+    view = model.default_traits_view()
+    assert view.id == "pyibisami.ibis_parser.Model"
+    assert model.default_traits_view() is view
+
+
+def test_model_plot_iv_lazy():
+    """Verify that the I-V plot is built on first use, and only once."""
+    model = Model(output_model())
+    assert "_traits_cache_plot_iv" not in model.__dict__
+    plot_iv = model.plot_iv
+    assert plot_iv.title == "Pull-Up/Down I-V Curves"
+    assert sorted(plot_iv.plots) == ["PD-Max", "PD-Min", "PD-Typ", "PU-Max", "PU-Min", "PU-Typ"]
+    assert model.plot_iv is plot_iv
+
+
+def test_proc_iv():
+    """Verify the arrays and impedances derived from an I-V table."""
+    vs, ityps, imins, imaxs, zs = _proc_iv(None, [(0.0, [0.0, 0.0, 0.0]), (1.0, [0.02, 0.01, 0.04])])
+    assert vs.tolist() == [0.0, 1.0]
+    assert ityps.tolist() == [0.0, 0.02]
+    assert imins.tolist() == [0.0, 0.01]
+    assert imaxs.tolist() == [0.0, 0.04]
+    assert zs == pytest.approx([50.0, 100.0, 25.0])
@@ -1,4 +1,4 @@
-from pyibisami.ibis.parser import parse_ibis_file
+from pyibisami.ibis.parser import parse_ibis_file, rest_line
 
 
 def test_parse_ibis_file_with_ideal_file(ibis_test_file):
@@ -10,3 +10,9 @@ def test_parse_ibis_file_with_ideal_file(ibis_test_file):
     assert ibis_dictionary["file_name"] == "example_tx.ibs"
     assert ibis_dictionary["file_rev"] == "v0.1"
     assert ibis_dictionary["ibis_ver"] == 5.1
+
+
+def test_rest_line():
+    """Test that ``rest_line`` takes the remainder of a line and skips what follows it."""
+    assert rest_line.parse("Some text, here.\r\n| comment\n  next") == "Some text, here."
+    assert rest_line.parse_partial("\nnext") == ("", "next")
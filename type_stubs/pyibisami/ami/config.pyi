@@ -1,11 +1,19 @@
+from types import MappingProxyType
+from typing import NamedTuple
+
 from _typeshed import Incomplete
 
-param_types: Incomplete
+class ParamType(NamedTuple):
+    c_type: str
+    ami_type: str
+    getter: str
+
+param_types: MappingProxyType[str, ParamType]
 
 def print_param(indent, name, param) -> None: ...
 def print_code(pname, param) -> None: ...
-def mk_model(ibis_params, ami_params, model_name, description, out_dir: str = ...) -> None: ...
-def ami_config(py_file) -> None: ...
+def mk_model(ibis_params, ami_params, model_name, description, out_dir: str = ..., force: bool = ...) -> None: ...
+def ami_config(py_file, force: bool = ...) -> None: ...
 def mk_combs(dict_items): ...
 def mk_tests(test_defs, file_base_name, test_dir: str = ...) -> None: ...
 def main(py_file, **kwd_args) -> None: ...
@@ -23,6 +23,7 @@ class AMIModel:
     def __del__(self) -> None: ...
     def initialize(self, init_object: AMIModelInitializer): ...
     def getWave(self, wave: Rvec, bits_per_call: int = ...) -> tuple[Rvec, Rvec]: ...
+    def getWaveInPlace(self, wave: Rvec, bits_per_call: int = ...) -> tuple[Rvec, Rvec, list[str]]: ...
     def get_responses(self, bits_per_call: int = ..., bit_gen: Iterator[int] = ...) -> dict[str, Any]: ...
     initOut: Incomplete
     channel_response: Incomplete
@@ -35,3 +36,7 @@ class AMIModel:
     msg: Incomplete
     clock_times: Incomplete
     info_params: Incomplete
+
+def process_lanes(
+    models: list[AMIModel], waves: list[Rvec], bits_per_call: int = ...
+) -> list[tuple[Rvec, Rvec, list[str]]]: ...
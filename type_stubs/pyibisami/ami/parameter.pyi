@@ -16,3 +16,4 @@ class AMIParameter:
     plist_tip: Incomplete
     msg: Incomplete
     def __init__(self, name, tags) -> None: ...
+    def __copy__(self) -> AMIParameter: ...
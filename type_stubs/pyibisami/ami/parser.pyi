@@ -1,6 +1,3 @@
-from collections.abc import Generator
-
-from _typeshed import Incomplete
 from traits.api import HasTraits
 
 from pyibisami.ami.parameter import AMIParamError as AMIParamError
@@ -24,31 +21,6 @@ class AMIParamConfigurator(HasTraits):
     @property
     def info_ami_params(self): ...
 
-whitespace: Incomplete
-comment: Incomplete
-ignore: Incomplete
-
-def lexeme(p): ...
-def int2tap(x): ...
-
-lparen: Incomplete
-rparen: Incomplete
-number: Incomplete
-integ: Incomplete
-nat: Incomplete
-tap_ix: Incomplete
-symbol: Incomplete
-true: Incomplete
-false: Incomplete
-ami_string: Incomplete
-atom: Incomplete
-node_name: Incomplete
-
-def node() -> Generator[Incomplete, Incomplete, Incomplete]: ...
-
-expr: Incomplete
-ami_defs: Incomplete
-
 def proc_branch(branch): ...
 def parse_ami_param_defs(param_str): ...
 def make_gui_items(pname, param, first_call: bool = ...): ...
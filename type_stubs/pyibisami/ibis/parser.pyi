@@ -13,7 +13,7 @@ ignore: Incomplete
 def logf(p, preStr: str = ...): ...
 def lexeme(p): ...
 def word(p): ...
-def rest_line() -> Generator[Incomplete, Incomplete, Incomplete]: ...
+rest_line: Incomplete
 
 skip_line: Incomplete
 name_only: Incomplete
@@ -24,6 +24,8 @@ false: Incomplete
 quoted_string: Incomplete
 skip_keyword: Incomplete
 IBIS_num_suf: Incomplete
+number_str: Incomplete
+num_suffix: Incomplete
 
 def number() -> Generator[Incomplete, Incomplete, Incomplete]: ...
 
@@ -40,7 +42,16 @@ ex_line: Incomplete
 
 def manyTrue(p): ...
 def many1True(p): ...
+
+keyword_open: Incomplete
+keyword_wordlets: Incomplete
+keyword_close: Incomplete
+
 def keyword(kywrd: str = ...): ...
+
+param_name: Incomplete
+param_value: Incomplete
+
 def param() -> Generator[Incomplete, Incomplete, Incomplete]: ...
 def node(valid_keywords, stop_keywords, debug: bool = ...): ...
 def end() -> Generator[Incomplete, None, Incomplete]: ...